@@ -0,0 +1,39 @@
+"""
+Ahead-of-time compile the indicator kernels in indicators_njit.py.
+
+Usage:
+    python build_indicators.py
+
+Builds the indicators_aot extension module next to this file. When it is
+present, indicators_njit uses it instead of JIT-compiling on first call, so
+fresh containers and CI runs skip the numba warm-up. Requires numba; the
+built .so is platform specific and is not committed (see .gitignore).
+"""
+
+import os
+import sys
+
+
+def main():
+    try:
+        from numba.pycc import CC
+    except ImportError:
+        print("✗ numba is not installed - nothing to build (pip install numba)")
+        return 1
+
+    import indicators_njit
+
+    cc = CC('indicators_aot')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.verbose = True
+
+    for name, (kernel, signature) in indicators_njit.AOT_SIGNATURES.items():
+        cc.export(name, signature)(kernel.py_func)
+
+    cc.compile()
+    print(f"✓ Built indicators_aot with {len(indicators_njit.AOT_SIGNATURES)} kernels in {cc.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+On-disk pickle cache shared by the scanner and the reports.
+
+Entries live under ~/.cache/market_scanner/<kind>/<key>.pkl and expire by
+file age, so nothing needs cleaning up between runs. The cache is best
+effort: unreadable entries count as misses and write failures are ignored.
+
+It also owns exit_history.json, the buy-zone exit log both email reports
+read and rewrite on every run.
+"""
+
+import json
+import os
+import pickle
+import threading
+import time
+from datetime import timedelta
+
+# orjson parses/serializes the exit history several times faster when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = lambda obj: json.dumps(obj, separators=(',', ':')).encode()
+
+CACHE_DIR = os.path.expanduser('~/.cache/market_scanner')
+EXIT_HISTORY_FILE = 'exit_history.json'
+EXIT_HISTORY_DAYS = 7  # Exits older than this are dropped on the next update
+
+# (mtime, parsed history) of the last exit_history.json read or written
+_exit_cache = None
+
+
+def cache_path(kind, key):
+    """Path of a cached pickle, e.g. ~/.cache/market_scanner/info/AAPL.pkl"""
+    return os.path.join(CACHE_DIR, kind, f"{key}.pkl")
+
+
+def cache_load(kind, key, ttl):
+    """Return the cached object if it exists and is younger than ttl seconds, else None"""
+    path = cache_path(kind, key)
+    try:
+        if os.path.getmtime(path) > time.time() - ttl:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+    return None
+
+
+def cache_store(kind, key, obj):
+    """Pickle obj into the cache; failures are ignored (the cache is best effort)"""
+    path = cache_path(kind, key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def load_exit_history():
+    """Parsed exit_history.json ({} if missing or unreadable), only re-read when the file has changed"""
+    global _exit_cache
+    try:
+        mtime = os.path.getmtime(EXIT_HISTORY_FILE)
+        if _exit_cache is None or _exit_cache[0] != mtime:
+            with open(EXIT_HISTORY_FILE, 'rb') as f:
+                _exit_cache = (mtime, _json_loads(f.read()))
+    except (OSError, ValueError):
+        return {}
+    return _exit_cache[1]
+
+
+def save_exit_history(history):
+    """Write history as compact JSON via a temp file renamed over the old one, so
+    a failed write leaves the previous history intact"""
+    global _exit_cache
+    tmp_path = f"{EXIT_HISTORY_FILE}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_json_dumps(history))
+        os.replace(tmp_path, EXIT_HISTORY_FILE)
+        _exit_cache = (os.path.getmtime(EXIT_HISTORY_FILE), history)
+    except (OSError, TypeError) as e:
+        print(f"⚠️ Could not save {EXIT_HISTORY_FILE}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def update_exit_history(all_results, now, extra_fields=()):
+    """Record tickers that left the buy zones since the last run and save the history.
+
+    An exit is a ticker listed as a buy last time that is now in the results
+    outside STRONG_BUY/BUY. Each exit record also copies extra_fields from its
+    result (default 0). Returns (history, exits from the last EXIT_HISTORY_DAYS
+    days, newest first).
+    """
+    history = load_exit_history()
+    
+    current_buys = set()
+    current_others = {}
+    for r in all_results:
+        if r.get('psar_zone') in ('STRONG_BUY', 'BUY'):
+            current_buys.add(r['ticker'])
+        else:
+            current_others[r['ticker']] = r
+    
+    exit_date = now.isoformat()
+    previous_buys = set(history.get('previous_buys', []))
+    new_exits = []
+    for ticker in (previous_buys & current_others.keys()) - current_buys:
+        result = current_others[ticker]
+        record = {
+            'ticker': ticker,
+            'exit_date': exit_date,
+            'exit_price': result['price'],
+            'psar_zone': result.get('psar_zone', 'UNKNOWN'),
+            'psar_momentum': result.get('psar_momentum', 5),
+        }
+        for field in extra_fields:
+            record[field] = result.get(field, 0)
+        new_exits.append(record)
+    
+    # exit_date is always a naive isoformat() string, so string order is date order
+    cutoff = (now - timedelta(days=EXIT_HISTORY_DAYS)).isoformat()
+    recent_exits = [e for e in history.get('exits', []) + new_exits if e['exit_date'] >= cutoff]
+    
+    history = {'previous_buys': list(current_buys), 'exits': recent_exits, 'last_updated': exit_date}
+    save_exit_history(history)
+    return history, sorted(recent_exits, key=lambda x: x['exit_date'], reverse=True)
@@ -8,6 +8,7 @@ import datetime
 import re
 import warnings
 from io import StringIO
+from cache_utils import cache_load, cache_store
 
 # Suppress warnings
 warnings.filterwarnings('ignore', category=FutureWarning)
@@ -15,6 +16,8 @@ warnings.filterwarnings('ignore', category=FutureWarning)
 # --- Configuration ---
 TOTAL_PCR_CORRECTION_WARN = 0.60
 TOTAL_PCR_OVERSOLD_BUY = 1.20
+# Reports built within a few minutes of each other share one browser fetch
+CBOE_CACHE_TTL = 5 * 60
 
 def _capture_analysis_output(total_pcr, data_time=None):
     """Generates the formatted string output based on the fetched data."""
@@ -49,6 +52,16 @@ def _capture_analysis_output(total_pcr, data_time=None):
 
 
 def get_cboe_ratios_and_analyze():
+    """Sentiment text for the report, from the disk cache when fresh (failures aren't cached)"""
+    sentiment_text = cache_load('cboe', 'sentiment', CBOE_CACHE_TTL)
+    if sentiment_text is None:
+        sentiment_text = _fetch_cboe_ratios_and_analyze()
+        if sentiment_text and 'FAILED' not in sentiment_text:
+            cache_store('cboe', 'sentiment', sentiment_text)
+    return sentiment_text
+
+
+def _fetch_cboe_ratios_and_analyze():
     """
     Fetches Cboe Put/Call Ratios using Selenium web scraping.
     
@@ -87,8 +100,9 @@ def get_cboe_ratios_and_analyze():
         
         # Try to parse HTML tables
         try:
-            dfs = pd.read_html(StringIO(page_text))
-            print(f"  Found {len(dfs)} tables")
+            # Only tables mentioning puts can hold the ratio data - skip building the rest
+            dfs = pd.read_html(StringIO(page_text), match=re.compile('put', re.IGNORECASE))
+            print(f"  Found {len(dfs)} put/call tables")
             
             # Look for the "Total" table - should have columns like TIME, CALLS, PUTS, TOTAL
             for i, df in enumerate(dfs):
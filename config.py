@@ -130,31 +130,36 @@ def get_all_tickers():
                 
                 source_name = list_name.replace('ibd_', '').upper()
                 
-                # Extract IBD stats for each ticker
-                for idx, row in df.iterrows():
-                    ticker = str(row.get(col_name, '')).strip()
+                # Extract IBD stats for each ticker, a column at a time
+                def column(name, default='N/A'):
+                    return df[name].tolist() if name in df.columns else [default] * len(df)
+                
+                stat_columns = {
+                    'Company': column('Company'),
+                    'Composite': column('Composite'),
+                    'EPS': column('EPS'),
+                    'RS': column('RS'),
+                    'GroupRS': column('GroupRS'),
+                    'SMR': column('SMR'),
+                    'AccDis': column('AccDis'),
+                    'OffHigh': column('OffHigh'),
+                    'Price_IBD': column('Price'),
+                    'Day50': column('Day50'),
+                    'Vol': column('Vol'),
+                    'BuyPoint': column('BuyPoint'),     # If you add this column
+                    'Comment': column('Comment', ''),   # If you add this column
+                }
+                list_tag = f"IBD {source_name}"
+                
+                for ticker, *values in zip(df[col_name].tolist(), *stat_columns.values()):
+                    ticker = str(ticker).strip()
                     if not ticker:
                         continue
                     
                     # Store all IBD stats
-                    ibd_stats[ticker] = {
-                        'Company': row.get('Company', 'N/A'),
-                        'Composite': row.get('Composite', 'N/A'),
-                        'EPS': row.get('EPS', 'N/A'),
-                        'RS': row.get('RS', 'N/A'),
-                        'GroupRS': row.get('GroupRS', 'N/A'),
-                        'SMR': row.get('SMR', 'N/A'),
-                        'AccDis': row.get('AccDis', 'N/A'),
-                        'OffHigh': row.get('OffHigh', 'N/A'),
-                        'Price_IBD': row.get('Price', 'N/A'),
-                        'Day50': row.get('Day50', 'N/A'),
-                        'Vol': row.get('Vol', 'N/A'),
-                        'BuyPoint': row.get('BuyPoint', 'N/A'),  # If you add this column
-                        'Comment': row.get('Comment', ''),        # If you add this column
-                        'IBD_List': f"IBD {source_name}"
-                    }
+                    ibd_stats[ticker] = dict(zip(stat_columns, values), IBD_List=list_tag)
                     
-                    ticker_sources.setdefault(ticker, []).append(f"IBD {source_name}")
+                    ticker_sources.setdefault(ticker, []).append(list_tag)
                     
             except Exception as e:
                 print(f"  [FAIL] Failed to read {filename}: {e}")
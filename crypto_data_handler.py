@@ -18,6 +18,9 @@ class CryptoDataHandler:
         'SUI20947-USD': 'sui'
     }
     
+    # Shared keep-alive session, so repeated CoinGecko calls skip the TLS handshake
+    _session = requests.Session()
+    
     @classmethod
     def is_crypto(cls, ticker: str) -> bool:
         """Check if ticker is a known crypto"""
@@ -51,7 +54,7 @@ class CryptoDataHandler:
                 'interval': 'daily'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = cls._session.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -89,7 +92,7 @@ class CryptoDataHandler:
                 'vs_currencies': 'usd'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = cls._session.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -73,12 +73,9 @@ def load_ibd_data():
                     continue
                 
                 # Find the header row (row where first cell is 'Symbol')
-                header_row = None
-                for i, row in df.iterrows():
-                    first_cell = str(row.iloc[0]).strip().upper()
-                    if first_cell == 'SYMBOL':
-                        header_row = i
-                        break
+                first_cells = df.iloc[:, 0].astype(str).str.strip().str.upper()
+                header_matches = first_cells.index[first_cells == 'SYMBOL']
+                header_row = header_matches[0] if len(header_matches) else None
                 
                 if header_row is None:
                     print(f"  ✗ Could not find header in {filename}")
@@ -113,47 +110,56 @@ def load_ibd_data():
                     elif col_upper == 'SMR RATING' or col_upper == 'SMR':
                         smr_col = col
                 
+                # Company name column for IBD URLs (first column mentioning company/name)
+                company_col = next((col for col in df.columns
+                                    if 'company' in str(col).lower() or 'name' in str(col).lower()), None)
+                
                 # Get list name for URLs
                 list_name = IBD_LIST_MAP.get(filename.replace('.csv', ''), 'ibd50')
+                source = filename.replace('.csv', '').replace('_', ' ').upper()
+                
+                # Skip invalid symbols: blanks, repeated headers, footnotes
+                symbols = df[symbol_col].astype(str).str.strip().str.upper()
+                valid = (
+                    (symbols != '') & (symbols != 'NAN') & (symbols != 'SYMBOL') &
+                    (symbols.str.len() <= 10) &
+                    symbols.str[0].str.isalpha().fillna(False).astype(bool)
+                )
+                df = df[valid]
+                symbols = symbols[valid]
+                
+                def ratings(col):
+                    if col is None:
+                        return ['N/A'] * len(df)
+                    return df[col].astype(object).where(df[col].notna(), 'N/A').tolist()
+                
+                if company_col is not None:
+                    companies = df[company_col].astype(object).where(df[company_col].notna(), None)
+                    companies = [c if c is None else str(c).strip() for c in companies]
+                else:
+                    companies = [None] * len(df)
                 
-                # Extract tickers and stats
-                count = 0
-                for _, row in df.iterrows():
-                    symbol = str(row[symbol_col]).strip().upper()
-                    
-                    # Skip invalid symbols
-                    if not symbol or symbol == 'NAN' or symbol == 'SYMBOL' or len(symbol) > 10:
-                        continue
-                    if not symbol[0].isalpha():
-                        continue
-                    
-                    all_ibd_tickers.append(symbol)
-                    count += 1
-                    
-                    # Get company name for IBD URL
-                    company_name = None
-                    for col in df.columns:
-                        if 'company' in str(col).lower() or 'name' in str(col).lower():
-                            company_name = str(row[col]).strip() if pd.notna(row[col]) else None
-                            break
-                    
-                    # Store stats
+                # Store stats
+                for symbol, composite, eps, rs, smr, company_name in zip(
+                        symbols, ratings(composite_col), ratings(eps_col),
+                        ratings(rs_col), ratings(smr_col), companies):
                     ibd_stats[symbol] = {
-                        'composite': row.get(composite_col, 'N/A') if composite_col else 'N/A',
-                        'eps': row.get(eps_col, 'N/A') if eps_col else 'N/A',
-                        'rs': row.get(rs_col, 'N/A') if rs_col else 'N/A',
-                        'smr': row.get(smr_col, 'N/A') if smr_col else 'N/A',
-                        'source': filename.replace('.csv', '').replace('_', ' ').upper(),
+                        'composite': composite,
+                        'eps': eps,
+                        'rs': rs,
+                        'smr': smr,
+                        'source': source,
                         'company_name': company_name,
                         'list': list_name
                     }
+                all_ibd_tickers.extend(symbols)
                 
-                print(f"  ✓ Loaded {count} tickers from {filename}")
+                print(f"  ✓ Loaded {len(symbols)} tickers from {filename}")
                 
             except Exception as e:
                 print(f"  ✗ Error loading {filename}: {e}")
     
-    unique_tickers = list(set(all_ibd_tickers))
+    unique_tickers = list(dict.fromkeys(all_ibd_tickers))
     print(f"  Total unique IBD tickers: {len(unique_tickers)}")
     return ibd_stats, unique_tickers
 
@@ -0,0 +1,408 @@
+"""
+Compiled indicator kernels for MarketScanner.calculate_indicators.
+
+Plain-numpy ports of the ta library indicators the scanner uses (PSAR,
+RSI, MACD, Bollinger Bands, Williams %R, Ultimate Oscillator). Each kernel
+uses ta's default parameters and follows pandas' ewm/rolling warm-up and
+NaN rules, so results match what ta returned.
+
+numba is optional. Without it the kernels run as ordinary Python loops
+over numpy arrays, which is still far cheaper than ta's per-row .iloc access.
+If build_indicators.py has been run, the ahead-of-time compiled
+indicators_aot extension is used instead, so there is no JIT warm-up at all.
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba isn't installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def _safe_div(num, den):
+    """num / den with numpy semantics for a zero denominator (inf or NaN)"""
+    if den == 0.0:
+        if num == 0.0 or math.isnan(num):
+            return np.nan
+        return math.copysign(np.inf, num)
+    return num / den
+
+
+@njit(cache=True)
+def _ewm(values, alpha, min_periods):
+    """pandas Series.ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean()"""
+    n = values.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+
+    old_wt_factor = 1.0 - alpha
+    weighted = values[0]
+    nobs = 0 if math.isnan(weighted) else 1
+    out[0] = weighted if nobs >= min_periods else np.nan
+    old_wt = 1.0
+
+    for i in range(1, n):
+        cur = values[i]
+        is_observation = not math.isnan(cur)
+        if is_observation:
+            nobs += 1
+        if not math.isnan(weighted):
+            old_wt *= old_wt_factor
+            if is_observation:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted if nobs >= min_periods else np.nan
+    return out
+
+
+@njit(cache=True)
+def _ewm_step(weighted, old_wt, nobs, cur, alpha):
+    """Advance _ewm's state (weighted, old_wt, nobs) by one value.
+
+    Starting from (nan, 1.0, 0) this reproduces _ewm exactly, for kernels
+    that only need the last value and shouldn't allocate the whole series.
+    """
+    is_observation = not math.isnan(cur)
+    if is_observation:
+        nobs += 1
+    if not math.isnan(weighted):
+        old_wt *= 1.0 - alpha
+        if is_observation:
+            if weighted != cur:
+                weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            old_wt = 1.0
+    elif is_observation:
+        weighted = cur
+    return weighted, old_wt, nobs
+
+
+@njit(cache=True)
+def _window_sum(values, window):
+    """Sum of the last `window` values, NaN if any is missing or too few rows"""
+    n = values.shape[0]
+    if n < window:
+        return np.nan
+    total = 0.0
+    for i in range(n - window, n):
+        if math.isnan(values[i]):
+            return np.nan
+        total += values[i]
+    return total
+
+
+@njit(cache=True)
+def _psar_loop(high, low, close, step=0.02, max_step=0.2):
+    """Parabolic SAR like ta.trend.PSARIndicator. Returns (psar, trend) arrays.
+
+    trend is 1 where ta's psar_up has a value, -1 where psar_down has one and
+    0 where both are NaN (the first two bars, or a NaN PSAR).
+    """
+    n = close.shape[0]
+    psar = close.copy()
+    trend = np.zeros(n, dtype=np.int8)
+    if n < 3:
+        return psar, trend
+
+    up_trend = True
+    acceleration_factor = step
+    up_trend_high = high[0]
+    down_trend_low = low[0]
+
+    for i in range(2, n):
+        reversal = False
+        max_high = high[i]
+        min_low = low[i]
+
+        if up_trend:
+            psar[i] = psar[i - 1] + acceleration_factor * (up_trend_high - psar[i - 1])
+
+            if min_low < psar[i]:
+                reversal = True
+                psar[i] = up_trend_high
+                down_trend_low = min_low
+                acceleration_factor = step
+            else:
+                if max_high > up_trend_high:
+                    up_trend_high = max_high
+                    acceleration_factor = min(acceleration_factor + step, max_step)
+
+                low1 = low[i - 1]
+                low2 = low[i - 2]
+                if low2 < psar[i]:
+                    psar[i] = low2
+                elif low1 < psar[i]:
+                    psar[i] = low1
+        else:
+            psar[i] = psar[i - 1] - acceleration_factor * (psar[i - 1] - down_trend_low)
+
+            if max_high > psar[i]:
+                reversal = True
+                psar[i] = down_trend_low
+                up_trend_high = max_high
+                acceleration_factor = step
+            else:
+                if min_low < down_trend_low:
+                    down_trend_low = min_low
+                    acceleration_factor = min(acceleration_factor + step, max_step)
+
+                high1 = high[i - 1]
+                high2 = high[i - 2]
+                if high2 > psar[i]:
+                    psar[i] = high2
+                elif high1 > psar[i]:
+                    psar[i] = high1
+
+        up_trend = up_trend != reversal  # XOR
+
+        if not math.isnan(psar[i]):
+            trend[i] = 1 if up_trend else -1
+
+    return psar, trend
+
+
+@njit(cache=True)
+def _rsi(close, window=14):
+    """Full RSI series like ta.momentum.RSIIndicator (Wilder smoothing)"""
+    n = close.shape[0]
+    up = np.zeros(n)
+    down = np.zeros(n)
+    for i in range(1, n):
+        diff = close[i] - close[i - 1]
+        if diff > 0:
+            up[i] = diff
+        elif diff < 0:
+            down[i] = -diff
+
+    emaup = _ewm(up, 1.0 / window, window)
+    emadn = _ewm(down, 1.0 / window, window)
+
+    out = np.empty(n)
+    for i in range(n):
+        if emadn[i] == 0.0:
+            out[i] = 100.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + emaup[i] / emadn[i])
+    return out
+
+
+@njit(cache=True)
+def _prsi_bullish(rsi_values, step=0.02, max_step=0.2):
+    """PSAR run on RSI, with 3-bar rolling high/low as the range.
+
+    rsi_values must already have the leading NaN warm-up removed.
+    Returns True if the RSI's PSAR is in an up trend on the last bar.
+    """
+    n = rsi_values.shape[0]
+    rsi_high = rsi_values.copy()
+    rsi_low = rsi_values.copy()
+    for i in range(2, n):
+        hi = rsi_values[i]
+        lo = rsi_values[i]
+        for j in range(i - 2, i):
+            if rsi_values[j] > hi:
+                hi = rsi_values[j]
+            if rsi_values[j] < lo:
+                lo = rsi_values[j]
+        rsi_high[i] = hi
+        rsi_low[i] = lo
+
+    psar, trend = _psar_loop(rsi_high, rsi_low, rsi_values, step, max_step)
+    return trend[n - 1] == 1
+
+
+@njit(cache=True)
+def _macd_last(close, window_fast=12, window_slow=26, window_sign=9):
+    """Last (macd, signal) values like ta.trend.MACD"""
+    alpha_fast = 2.0 / (1.0 + window_fast)
+    alpha_slow = 2.0 / (1.0 + window_slow)
+    alpha_sign = 2.0 / (1.0 + window_sign)
+    # All three EMAs are run as scalar state in one pass - no series are built
+    fast, fast_wt, fast_n = np.nan, 1.0, 0
+    slow, slow_wt, slow_n = np.nan, 1.0, 0
+    sign, sign_wt, sign_n = np.nan, 1.0, 0
+    macd = np.nan
+    signal = np.nan
+    for i in range(close.shape[0]):
+        fast, fast_wt, fast_n = _ewm_step(fast, fast_wt, fast_n, close[i], alpha_fast)
+        slow, slow_wt, slow_n = _ewm_step(slow, slow_wt, slow_n, close[i], alpha_slow)
+        ema_fast = fast if fast_n >= window_fast else np.nan
+        ema_slow = slow if slow_n >= window_slow else np.nan
+        macd = ema_fast - ema_slow
+        sign, sign_wt, sign_n = _ewm_step(sign, sign_wt, sign_n, macd, alpha_sign)
+        signal = sign if sign_n >= window_sign else np.nan
+    return macd, signal
+
+
+@njit(cache=True)
+def _ema_last(values, span):
+    """Last value of pandas Series.ewm(span=span, adjust=False).mean()"""
+    alpha = 2.0 / (span + 1.0)
+    weighted, old_wt, nobs = np.nan, 1.0, 0
+    for i in range(values.shape[0]):
+        weighted, old_wt, nobs = _ewm_step(weighted, old_wt, nobs, values[i], alpha)
+    return weighted if nobs >= 1 else np.nan
+
+
+@njit(cache=True)
+def _bb_last(close, window=20, window_dev=2.0):
+    """Last (lower, upper) Bollinger Band values like ta.volatility.BollingerBands"""
+    n = close.shape[0]
+    if n < window:
+        return np.nan, np.nan
+    mavg = _window_sum(close, window) / window
+    sq = 0.0
+    for i in range(n - window, n):
+        sq += (close[i] - mavg) ** 2
+    mstd = math.sqrt(sq / window)  # ddof=0, as ta uses
+    return mavg - window_dev * mstd, mavg + window_dev * mstd
+
+
+@njit(cache=True)
+def _willr_last(high, low, close, lbp=14):
+    """Last Williams %R value like ta.momentum.WilliamsRIndicator"""
+    n = close.shape[0]
+    if n < lbp:
+        return np.nan
+    highest_high = -np.inf
+    lowest_low = np.inf
+    for i in range(n - lbp, n):
+        if math.isnan(high[i]) or math.isnan(low[i]):
+            return np.nan
+        if high[i] > highest_high:
+            highest_high = high[i]
+        if low[i] < lowest_low:
+            lowest_low = low[i]
+    return _safe_div(-100.0 * (highest_high - close[n - 1]), highest_high - lowest_low)
+
+
+@njit(cache=True)
+def _uo_last(high, low, close, window1=7, window2=14, window3=28,
+            weight1=4.0, weight2=2.0, weight3=1.0):
+    """Last Ultimate Oscillator value like ta.momentum.UltimateOscillator"""
+    n = close.shape[0]
+    # Only the longest window's bars feed the sums
+    start = max(0, n - max(window1, window2, window3))
+    buying_pressure = np.empty(n - start)
+    true_range = np.empty(n - start)
+    for i in range(start, n):
+        hl = high[i] - low[i]
+        if i == 0:
+            # No previous close: pressure is undefined, range is just high - low
+            buying_pressure[0] = np.nan
+            true_range[0] = hl
+            continue
+        prev_close = close[i - 1]
+        if math.isnan(low[i]) or math.isnan(prev_close):
+            buying_pressure[i - start] = np.nan
+        else:
+            buying_pressure[i - start] = close[i] - min(low[i], prev_close)
+        # Max of the three ranges, skipping missing ones
+        tr = np.nan
+        for cand in (hl, abs(high[i] - prev_close), abs(low[i] - prev_close)):
+            if not math.isnan(cand) and (math.isnan(tr) or cand > tr):
+                tr = cand
+        true_range[i - start] = tr
+
+    avg_s = _safe_div(_window_sum(buying_pressure, window1), _window_sum(true_range, window1))
+    avg_m = _safe_div(_window_sum(buying_pressure, window2), _window_sum(true_range, window2))
+    avg_l = _safe_div(_window_sum(buying_pressure, window3), _window_sum(true_range, window3))
+    return 100.0 * (weight1 * avg_s + weight2 * avg_m + weight3 * avg_l) / (weight1 + weight2 + weight3)
+
+
+@njit(cache=True)
+def _psar_last_batch(high, low, close, offsets, step=0.02, max_step=0.2):
+    """Last PSAR value and trend for many tickers in one call.
+
+    Histories are concatenated end to end; ticker k spans
+    offsets[k]:offsets[k + 1], so tickers with short histories need no padding.
+    Returns (psar_last, bullish) arrays with one entry per ticker. Runs on one
+    core: numba's parallel threads don't survive the indicator pool's fork.
+    """
+    count = offsets.shape[0] - 1
+    psar_last = np.full(count, np.nan)
+    bullish = np.zeros(count, dtype=np.bool_)
+    for k in range(count):
+        start = offsets[k]
+        end = offsets[k + 1]
+        if end == start:
+            continue
+        psar, trend = _psar_loop(high[start:end], low[start:end], close[start:end], step, max_step)
+        psar_last[k] = psar[end - start - 1]
+        bullish[k] = trend[end - start - 1] == 1
+    return psar_last, bullish
+
+
+# Kernels exported by build_indicators.py, with their AOT signatures.
+# Exported functions take every argument explicitly (no defaults).
+AOT_SIGNATURES = {
+    'psar_loop': (_psar_loop, 'Tuple((f8[:], i1[:]))(f8[:], f8[:], f8[:], f8, f8)'),
+    'rsi': (_rsi, 'f8[:](f8[:], i8)'),
+    'prsi_bullish': (_prsi_bullish, 'b1(f8[:], f8, f8)'),
+    'macd_last': (_macd_last, 'UniTuple(f8, 2)(f8[:], i8, i8, i8)'),
+    'ema_last': (_ema_last, 'f8(f8[:], i8)'),
+    'bb_last': (_bb_last, 'UniTuple(f8, 2)(f8[:], i8, f8)'),
+    'willr_last': (_willr_last, 'f8(f8[:], f8[:], f8[:], i8)'),
+    'uo_last': (_uo_last, 'f8(f8[:], f8[:], f8[:], i8, i8, i8, f8, f8, f8)'),
+    'psar_last_batch': (_psar_last_batch, 'Tuple((f8[:], b1[:]))(f8[:], f8[:], f8[:], i8[:], f8, f8)'),
+}
+
+try:
+    import indicators_aot as _aot
+except ImportError:
+    _aot = None
+
+if _aot is not None:
+    def psar_loop(high, low, close, step=0.02, max_step=0.2):
+        return _aot.psar_loop(high, low, close, step, max_step)
+
+    def rsi(close, window=14):
+        return _aot.rsi(close, window)
+
+    def prsi_bullish(rsi_values, step=0.02, max_step=0.2):
+        return _aot.prsi_bullish(rsi_values, step, max_step)
+
+    def macd_last(close, window_fast=12, window_slow=26, window_sign=9):
+        return _aot.macd_last(close, window_fast, window_slow, window_sign)
+
+    def ema_last(values, span):
+        return _aot.ema_last(values, span)
+
+    def bb_last(close, window=20, window_dev=2.0):
+        return _aot.bb_last(close, window, window_dev)
+
+    def willr_last(high, low, close, lbp=14):
+        return _aot.willr_last(high, low, close, lbp)
+
+    def uo_last(high, low, close, window1=7, window2=14, window3=28,
+                weight1=4.0, weight2=2.0, weight3=1.0):
+        return _aot.uo_last(high, low, close, window1, window2, window3, weight1, weight2, weight3)
+
+    def psar_last_batch(high, low, close, offsets, step=0.02, max_step=0.2):
+        return _aot.psar_last_batch(high, low, close, offsets, step, max_step)
+else:
+    psar_loop = _psar_loop
+    rsi = _rsi
+    prsi_bullish = _prsi_bullish
+    macd_last = _macd_last
+    ema_last = _ema_last
+    bb_last = _bb_last
+    willr_last = _willr_last
+    uo_last = _uo_last
+    psar_last_batch = _psar_last_batch
@@ -1,18 +1,23 @@
 import warnings
-# Suppress the FutureWarning from ta library
+# Suppress FutureWarning/DeprecationWarning noise from yfinance and pandas
 warnings.filterwarnings('ignore', category=FutureWarning)
 warnings.filterwarnings('ignore', category=DeprecationWarning)
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import math
 import os
 import requests
-from ta.trend import MACD, PSARIndicator
-from ta.volatility import BollingerBands
-from ta.momentum import WilliamsRIndicator, UltimateOscillator, RSIIndicator
-from ta.trend import CCIIndicator
+import threading
+import time
+from collections import Counter
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from types import MappingProxyType
+from cache_utils import cache_load, cache_store
+from indicators_njit import psar_loop, rsi as rsi_kernel, prsi_bullish as prsi_kernel
+from indicators_njit import macd_last, ema_last, bb_last, willr_last, uo_last, psar_last_batch
 
 # Import IBD utilities
 try:
@@ -23,9 +28,53 @@ except ImportError:
     get_ibd_url = None
     is_ibd_stock = None
 
+# pyarrow's CSV parser is much faster for the large ticker lists; optional
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
 # Cache for FINRA short interest data (to avoid repeated API calls)
 _finra_short_cache = {}
 
+# On-disk cache (see cache_utils) for Ticker.info and price history, shared across runs
+INFO_CACHE_TTL = 24 * 3600  # Company info changes slowly
+HIST_CACHE_TTL = 4 * 3600   # Short enough that a later re-run picks up new bars
+HIST_TOPUP_MAX_AGE = 7 * 24 * 3600  # Older histories are downloaded in full again
+FINRA_CACHE_TTL = 24 * 3600  # FINRA only publishes short interest twice a month
+
+# The Ticker.info fields the scanner reads; only these are kept and cached
+INFO_FIELDS = (
+    'longName', 'exchange', 'quoteType', 'sector', 'marketCap',
+    'dividendYield', 'dividendRate', 'currentPrice', 'regularMarketPrice',
+    'forwardEps', 'trailingEps', 'earningsGrowth', 'revenueGrowth',
+    'shortPercentOfFloat', 'shortRatio', 'sharesOutstanding', 'floatShares',
+)
+
+# Ticker list tags in display order (results carry them as a joined string)
+SOURCE_ORDER = ('S&P 500', 'NASDAQ 100', 'Russell 2000', 'IBD', 'ADR')
+
+# The only history columns calculate_indicators reads
+HIST_COLUMNS = ['High', 'Low', 'Close', 'Volume']
+
+# Shared read-only IBD fields for tickers not on any IBD list (the common case)
+_EMPTY_IBD = MappingProxyType({'composite': 'N/A', 'eps': 'N/A', 'rs': 'N/A', 'smr': 'N/A'})
+
+# Tickers per yf.download request in the broad market scan
+BULK_DOWNLOAD_CHUNK = 20
+
+# Concurrent Ticker.info requests in the broad market scan
+INFO_FETCH_WORKERS = 32
+
+# One keep-alive session for FINRA lookups, sized for the info fetch threads
+# (yfinance already shares its own session across all Ticker objects)
+_finra_session = requests.Session()
+_finra_session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=INFO_FETCH_WORKERS))
+
+# Below this many tickers, process pool startup costs more than it saves
+INDICATOR_POOL_MIN_BATCH = 64
+
 # Note: Market sentiment (Put/Call ratio) is now handled by cboe.py using Selenium
 
 def get_finra_short_interest(ticker):
@@ -41,6 +90,11 @@ def get_finra_short_interest(ticker):
     if ticker in _finra_short_cache:
         return _finra_short_cache[ticker]
     
+    cached = cache_load('finra', ticker, FINRA_CACHE_TTL)
+    if cached is not None:
+        _finra_short_cache[ticker] = cached
+        return cached
+    
     try:
         url = "https://api.finra.org/data/group/otcMarket/name/EquityShortInterest"
         
@@ -61,7 +115,7 @@ def get_finra_short_interest(ticker):
             "Accept": "application/json"
         }
         
-        response = requests.post(url, json=payload, headers=headers, timeout=5)
+        response = _finra_session.post(url, json=payload, headers=headers, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -73,7 +127,11 @@ def get_finra_short_interest(ticker):
                 
                 result = (short_shares, avg_volume, days_to_cover)
                 _finra_short_cache[ticker] = result
+                cache_store('finra', ticker, result)
                 return result
+            
+            # FINRA has nothing for this ticker - remember that across runs too
+            cache_store('finra', ticker, (None, None, None))
         
         # Not found or error
         _finra_short_cache[ticker] = (None, None, None)
@@ -84,6 +142,26 @@ def get_finra_short_interest(ticker):
         return (None, None, None)
 
 
+def _slim_history(hist):
+    """Keep only the columns the indicators use, stored as float32.
+    
+    Halves the memory held for thousands of histories (and the bytes pickled
+    to the indicator process pool and the disk cache). calculate_indicators
+    upcasts back to float64 before doing any math.
+    """
+    return hist[HIST_COLUMNS].astype(np.float32)
+
+
+def _history_block(hist):
+    """High/Low/Close/Volume as the rows of one (4, n) array, keeping the dtype.
+    
+    This is what calculate_indicators_block() works on, and what is sent to
+    the indicator process pool - a bare array pickles far faster than a
+    DataFrame with its index.
+    """
+    return hist[HIST_COLUMNS].to_numpy().T
+
+
 class MarketScanner:
     def __init__(self, min_market_cap_billions=10):
         self.results = []
@@ -92,6 +170,7 @@ class MarketScanner:
         self.min_market_cap = min_market_cap_billions * 1_000_000_000  # Convert to dollars
         self.min_market_cap_billions = min_market_cap_billions
         self.filter_reasons = {}  # Track why stocks are filtered
+        self._filter_lock = threading.Lock()
         self.short_interest_overrides = self.load_short_interest_csv()
     
     def load_short_interest_csv(self):
@@ -107,21 +186,19 @@ class MarketScanner:
         
         if os.path.exists(csv_file):
             try:
-                import csv
-                with open(csv_file, 'r', encoding='utf-8-sig') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        symbol = row.get('Symbol', '').strip().upper()
-                        if symbol:
-                            try:
-                                short_pct = float(row.get('ShortPercent', 0)) if row.get('ShortPercent') else None
-                                days = float(row.get('DaysToCover', 0)) if row.get('DaysToCover') else None
-                                overrides[symbol] = {
-                                    'short_percent': short_pct,
-                                    'days_to_cover': days
-                                }
-                            except ValueError:
-                                pass
+                # One C-level parse; '#' lines in the file are notes, not rows
+                df = pd.read_csv(csv_file, encoding='utf-8-sig', comment='#',
+                                 usecols=['Symbol', 'ShortPercent', 'DaysToCover'])
+                df = df.dropna(subset=['Symbol'])
+                symbols = df['Symbol'].astype(str).str.strip().str.upper()
+                short_pcts = pd.to_numeric(df['ShortPercent'], errors='coerce')
+                days = pd.to_numeric(df['DaysToCover'], errors='coerce')
+                for symbol, short_pct, days_to_cover in zip(symbols, short_pcts, days):
+                    if symbol:
+                        overrides[symbol] = {
+                            'short_percent': float(short_pct) if pd.notna(short_pct) else None,
+                            'days_to_cover': float(days_to_cover) if pd.notna(days_to_cover) else None
+                        }
                 if overrides:
                     print(f"✓ Loaded {len(overrides)} short interest overrides from {csv_file}")
             except Exception as e:
@@ -159,8 +236,9 @@ class MarketScanner:
                             print(f"  ⚠️ Skipping duplicate: {ticker}")
                 
                 print(f"\n✓ Loaded {len(watchlist)} unique tickers from custom watchlist")
-                for ticker in watchlist:
-                    print(f"  - {ticker}")
+                if watchlist:
+                    # One write for the whole listing rather than a print per ticker
+                    print("\n".join(f"  - {ticker}" for ticker in watchlist))
             except Exception as e:
                 print(f"✗ Error loading custom watchlist: {e}")
         else:
@@ -189,7 +267,7 @@ class MarketScanner:
         csv_file = 'sp500_tickers.csv'
         if os.path.exists(csv_file):
             try:
-                df = pd.read_csv(csv_file)
+                df = pd.read_csv(csv_file, engine=CSV_ENGINE, usecols=['Symbol'])
                 tickers = df['Symbol'].tolist()
                 print(f"✓ Loaded {len(tickers)} S&P 500 tickers from CSV")
                 return tickers
@@ -204,7 +282,7 @@ class MarketScanner:
         csv_file = 'nasdaq100_tickers.csv'
         if os.path.exists(csv_file):
             try:
-                df = pd.read_csv(csv_file)
+                df = pd.read_csv(csv_file, engine=CSV_ENGINE, usecols=['Symbol'])
                 tickers = df['Symbol'].tolist()
                 print(f"✓ Loaded {len(tickers)} NASDAQ 100 tickers from CSV")
                 return tickers
@@ -219,7 +297,7 @@ class MarketScanner:
         csv_file = 'russell2000_tickers.csv'
         if os.path.exists(csv_file):
             try:
-                df = pd.read_csv(csv_file)
+                df = pd.read_csv(csv_file, engine=CSV_ENGINE, usecols=['Symbol'])
                 tickers = df['Symbol'].tolist()
                 print(f"✓ Loaded {len(tickers)} Russell 2000 tickers from CSV")
                 return tickers
@@ -235,7 +313,7 @@ class MarketScanner:
         csv_file = 'adr_tickers.csv'
         if os.path.exists(csv_file):
             try:
-                df = pd.read_csv(csv_file)
+                df = pd.read_csv(csv_file, engine=CSV_ENGINE, usecols=['Symbol'])
                 tickers = df['Symbol'].tolist()
                 print(f"✓ Loaded {len(tickers)} ADR tickers from CSV")
                 return tickers
@@ -284,165 +362,224 @@ class MarketScanner:
         print(f"✓ Using built-in list of {len(major_adrs)} major ADRs")
         return major_adrs
     
-    def get_dividend_yield(self, ticker_obj):
-        """Get dividend yield for a ticker - FIXED VERSION with validation"""
+    def _cached_info(self, symbol, ticker_obj=None):
+        """The INFO_FIELDS of Ticker.info for a symbol, served from the on-disk cache when fresh"""
+        import yfinance as yf
+        
+        info = cache_load('info', symbol, INFO_CACHE_TTL)
+        if info is None:
+            ticker_obj = ticker_obj or yf.Ticker(symbol)
+            # Retry on rate limit, like the history() fetch in prepare_ticker
+            max_retries = 2
+            for attempt in range(max_retries):
+                try:
+                    info = ticker_obj.info
+                    break
+                except Exception as e:
+                    if 'rate' in str(e).lower() or '429' in str(e):
+                        if attempt < max_retries - 1:
+                            time.sleep(5)  # Wait 5 seconds on rate limit
+                            continue
+                    raise e
+            if info:
+                info = {field: info[field] for field in INFO_FIELDS if field in info}
+                cache_store('info', symbol, info)
+        return info
+    
+    def get_dividend_yield(self, info):
+        """Get dividend yield from a Ticker.info dict - FIXED VERSION with validation"""
         try:
-            info = ticker_obj.info
-            
             # Method 1: Direct dividendYield (yfinance returns as decimal, e.g., 0.02 = 2%)
-            div_yield = info.get('dividendYield', None)
+            div_yield = info.get('dividendYield')
             if div_yield and div_yield > 0:
-                # Check if it's already a percentage (>1) or decimal (<1)
-                if div_yield > 1:
-                    # Already a percentage, don't multiply
-                    result = round(div_yield, 2)
-                else:
-                    # Decimal form, convert to percentage
-                    result = round(div_yield * 100, 2)
-                
-                # Sanity check - cap at 25% (anything higher is likely an error)
-                if result > 25:
+                # Already a percentage (>1) or decimal form (<1) that needs converting
+                result = round(div_yield if div_yield > 1 else div_yield * 100, 2)
+            else:
+                # Method 2: Calculate from dividendRate and price (the price is only
+                # looked up when there is a rate)
+                div_rate = info.get('dividendRate')
+                if not (div_rate and div_rate > 0):
                     return 0.0
-                return result
-            
-            # Method 2: Calculate from dividendRate and price
-            div_rate = info.get('dividendRate', None)
-            price = info.get('currentPrice', info.get('regularMarketPrice', None))
-            
-            if div_rate and price and div_rate > 0 and price > 0:
-                result = round((div_rate / price) * 100, 2)
-                # Sanity check
-                if result > 25:
+                price = info['currentPrice'] if 'currentPrice' in info else info.get('regularMarketPrice')
+                if not (price and price > 0):
                     return 0.0
-                return result
+                result = round((div_rate / price) * 100, 2)
             
-            return 0.0
+            # Sanity check - cap at 25% (anything higher is likely an error)
+            return result if result <= 25 else 0.0
         except Exception as e:
             return 0.0
     
+    @staticmethod
+    def format_sources(sources):
+        """Display string for a set of source tags, e.g. 'S&P 500, NASDAQ 100, IBD'"""
+        return ', '.join(tag for tag in SOURCE_ORDER if tag in sources)
+    
     def load_all_tickers_with_sources(self, include_adr=False):
-        """Load all tickers and track their sources"""
+        """Load all tickers and track their sources.
+        
+        Returns {ticker: set of source tags}; see format_sources() for display.
+        """
         ticker_sources = {}
         
         print("\n" + "="*60)
         print("LOADING TICKER LISTS")
         print("="*60)
         
-        # Load S&P 500
-        sp500 = self.load_sp500_tickers()
-        for ticker in sp500:
-            ticker_sources[ticker] = 'S&P 500'
-        
-        # Load NASDAQ 100
-        nasdaq100 = self.load_nasdaq100_tickers()
-        for ticker in nasdaq100:
-            if ticker in ticker_sources:
-                ticker_sources[ticker] += ', NASDAQ 100'
-            else:
-                ticker_sources[ticker] = 'NASDAQ 100'
-        
-        # Load Russell 2000
-        russell2000 = self.load_russell2000_tickers()
-        for ticker in russell2000:
-            if ticker not in ticker_sources:
-                ticker_sources[ticker] = 'Russell 2000'
+        # IBD files are Excel workbooks and the slowest list to read - load them
+        # in the background while the index CSVs are read
+        with ThreadPoolExecutor(max_workers=1) as ibd_pool:
+            ibd_future = ibd_pool.submit(self.load_ibd_stats)
+            
+            # Load S&P 500
+            sp500 = self.load_sp500_tickers()
+            for ticker in sp500:
+                ticker_sources.setdefault(ticker, set()).add('S&P 500')
+            
+            # Load NASDAQ 100
+            nasdaq100 = self.load_nasdaq100_tickers()
+            for ticker in nasdaq100:
+                ticker_sources.setdefault(ticker, set()).add('NASDAQ 100')
+            
+            # Load Russell 2000 (only tagged when not already in a bigger index)
+            russell2000 = self.load_russell2000_tickers()
+            for ticker in russell2000:
+                ticker_sources.setdefault(ticker, {'Russell 2000'})
+            
+            # Load IBD
+            ibd_tickers = ibd_future.result()
         
-        # Load IBD
-        ibd_tickers = self.load_ibd_stats()
         for ticker in ibd_tickers:
-            if ticker in ticker_sources:
-                ticker_sources[ticker] += ', IBD'
-            else:
-                ticker_sources[ticker] = 'IBD'
+            ticker_sources.setdefault(ticker, set()).add('IBD')
         
         # Load ADRs if requested
         if include_adr:
             adr_tickers = self.load_adr_tickers()
             for ticker in adr_tickers:
-                if ticker in ticker_sources:
-                    ticker_sources[ticker] += ', ADR'
-                else:
-                    ticker_sources[ticker] = 'ADR'
+                ticker_sources.setdefault(ticker, set()).add('ADR')
+        
+        # Tally every source tag in one pass
+        source_counts = Counter()
+        russell_only = 0
+        for sources in ticker_sources.values():
+            source_counts.update(sources)
+            if sources == {'Russell 2000'}:
+                russell_only += 1
         
         print(f"\n{'='*60}")
         print(f"TICKER LIST SUMMARY")
         print(f"{'='*60}")
         print(f"Total unique tickers: {len(ticker_sources)}")
-        print(f"  - S&P 500: {len([t for t, s in ticker_sources.items() if 'S&P 500' in s])}")
-        print(f"  - NASDAQ 100: {len([t for t, s in ticker_sources.items() if 'NASDAQ 100' in s])}")
-        print(f"  - Russell 2000 only: {len([t for t, s in ticker_sources.items() if s == 'Russell 2000'])}")
-        print(f"  - IBD: {len([t for t, s in ticker_sources.items() if 'IBD' in s])}")
+        print(f"  - S&P 500: {source_counts['S&P 500']}")
+        print(f"  - NASDAQ 100: {source_counts['NASDAQ 100']}")
+        print(f"  - Russell 2000 only: {russell_only}")
+        print(f"  - IBD: {source_counts['IBD']}")
         if include_adr:
-            print(f"  - ADR: {len([t for t, s in ticker_sources.items() if 'ADR' in s])}")
+            print(f"  - ADR: {source_counts['ADR']}")
         print(f"{'='*60}\n")
         
         return ticker_sources
     
-    def calculate_indicators(self, hist):
-        """Calculate all technical indicators"""
+    @staticmethod
+    def results_frame(results, columns=None):
+        """Columnar (one row per ticker) DataFrame view of a list of scan results.
+        
+        Rows stay in the same order as results, so boolean masks over the
+        frame can be zipped back onto the original result dicts.
+        """
+        if columns is None:
+            frame = pd.DataFrame.from_records(results)
+        else:
+            frame = pd.DataFrame({col: [r.get(col) for r in results] for col in columns})
+        for col in ('eps_growth', 'rev_growth'):
+            if col in frame.columns:
+                frame[col] = pd.to_numeric(frame[col], errors='coerce')
+        return frame
+    
+    @staticmethod
+    def psar_distance(current_price, psar_value, is_bullish):
+        """Percent distance from price to PSAR - NEGATIVE for sells, POSITIVE for buys"""
+        if pd.notna(psar_value) and psar_value > 0 and pd.notna(current_price) and current_price > 0:
+            raw_distance = abs((current_price - psar_value) / current_price) * 100
+            # Make it negative if PSAR is above price (sell signal)
+            return raw_distance if is_bullish else -raw_distance
+        return 0.0
+    
+    @staticmethod
+    def wrong_trend(mode, is_bullish):
+        """True if a long/short scan will drop this ticker for its PSAR trend"""
+        return (mode == 'long' and not is_bullish) or (mode == 'short' and is_bullish)
+    
+    @staticmethod
+    def trend_only_result(current_price, psar_value, is_bullish, psar_distance):
+        """Minimal indicator dict for tickers skipped as the wrong trend"""
+        return {
+            'price': float(current_price),
+            'psar_value': float(psar_value),
+            'psar_bullish': bool(is_bullish),
+            'psar_distance': float(psar_distance),
+            'signal_weight': 0,
+        }
+    
+    @staticmethod
+    def calculate_indicators(hist, mode='all'):
+        """Calculate all technical indicators for a price history DataFrame.
+        
+        mode='long' or mode='short' skips everything after PSAR for tickers
+        trending the other way and returns just the PSAR basics, since the
+        caller is going to drop them anyway.
+        """
+        try:
+            block = _history_block(hist)
+        except Exception:
+            return None
+        return MarketScanner.calculate_indicators_block(block, mode)
+    
+    @staticmethod
+    def calculate_indicators_block(block, mode='all'):
+        """Calculate all technical indicators from a _history_block() array"""
         try:
+            # Plain float64 arrays for the compiled kernels in indicators_njit
+            # (histories may be stored as float32; all the math is done in float64)
+            high, low, close, volume = block.astype(np.float64, copy=False)
+            
             # PSAR
-            psar_indicator = PSARIndicator(high=hist['High'], low=hist['Low'], close=hist['Close'])
-            psar = psar_indicator.psar()
-            psar_up = psar_indicator.psar_up()
-            psar_down = psar_indicator.psar_down()
-            
-            current_price = hist['Close'].iloc[-1]
-            psar_value = psar.iloc[-1]
-            is_bullish = pd.notna(psar_up.iloc[-1])
-            
-            # Calculate PSAR distance safely - NEGATIVE for sells, POSITIVE for buys
-            if pd.notna(psar_value) and psar_value > 0 and pd.notna(current_price) and current_price > 0:
-                raw_distance = abs((current_price - psar_value) / current_price) * 100
-                # Make it negative if PSAR is above price (sell signal)
-                if not is_bullish:
-                    psar_distance = -raw_distance
-                else:
-                    psar_distance = raw_distance
-            else:
-                psar_distance = 0.0
+            psar, psar_trend = psar_loop(high, low, close)
+            
+            current_price = close[-1]
+            psar_value = psar[-1]
+            is_bullish = bool(psar_trend[-1] == 1)
+            
+            psar_distance = MarketScanner.psar_distance(current_price, psar_value, is_bullish)
             
             # Validate - skip if NaN
-            if pd.isna(psar_distance) or pd.isna(current_price) or pd.isna(psar_value):
+            if math.isnan(psar_distance) or math.isnan(current_price) or math.isnan(psar_value):
                 return None
             
+            # Wrong trend for this scan - no point computing the rest
+            if MarketScanner.wrong_trend(mode, is_bullish):
+                return MarketScanner.trend_only_result(current_price, psar_value, is_bullish, psar_distance)
+            
             # ==========================================
             # PSAR MOMENTUM SCORE (1-10)
             # Combines: direction, trajectory since signal start, current distance
             # ==========================================
             
             # Find when the current signal started and get distance at that point
-            days_since_signal = 0
             signal_start_distance = abs(psar_distance)  # Default to current
             
-            if is_bullish:
-                # Count backwards to find when PSAR flipped to buy
-                for i in range(len(psar_up) - 1, -1, -1):
-                    if pd.notna(psar_up.iloc[i]):
-                        days_since_signal += 1
-                    else:
-                        break
-                # Get distance at signal start
-                if days_since_signal > 0 and days_since_signal < len(hist):
-                    start_idx = -days_since_signal
-                    start_price = hist['Close'].iloc[start_idx]
-                    start_psar = psar.iloc[start_idx]
-                    if pd.notna(start_psar) and start_psar > 0:
-                        signal_start_distance = abs((start_price - start_psar) / start_price) * 100
-            else:
-                # Count backwards to find when PSAR flipped to sell
-                for i in range(len(psar_down) - 1, -1, -1):
-                    if pd.notna(psar_down.iloc[i]):
-                        days_since_signal += 1
-                    else:
-                        break
-                # Get distance at signal start
-                if days_since_signal > 0 and days_since_signal < len(hist):
-                    start_idx = -days_since_signal
-                    start_price = hist['Close'].iloc[start_idx]
-                    start_psar = psar.iloc[start_idx]
-                    if pd.notna(start_psar) and start_psar > 0:
-                        signal_start_distance = abs((start_price - start_psar) / start_price) * 100
+            # Count backwards to find when PSAR flipped to the current side:
+            # the run of bars since the last bar not on the current side
+            gaps = np.flatnonzero(psar_trend != (1 if is_bullish else -1))
+            days_since_signal = len(psar_trend) - 1 - int(gaps[-1]) if len(gaps) else len(psar_trend)
+            
+            # Get distance at signal start
+            if days_since_signal > 0 and days_since_signal < len(close):
+                start_idx = -days_since_signal
+                start_price = close[start_idx]
+                start_psar = psar[start_idx]
+                if not math.isnan(start_psar) and start_psar > 0:
+                    signal_start_distance = abs((start_price - start_psar) / start_price) * 100
             
             # Calculate PSAR Delta (ratio of start distance to current distance)
             current_abs_distance = abs(psar_distance)
@@ -528,59 +665,67 @@ class MarketScanner:
                 psar_zone = 'SELL'
             
             # 52-week high and % off high
-            high_52w = hist['High'].tail(252).max() if len(hist) >= 252 else hist['High'].max()
+            high_52w = np.nanmax(high[-252:])
             pct_off_high = ((high_52w - current_price) / high_52w) * 100 if high_52w > 0 else 0
             
             # 50-day moving average
-            ma_50 = hist['Close'].tail(50).mean() if len(hist) >= 50 else hist['Close'].mean()
+            ma_50 = np.nanmean(close[-50:])
             above_ma50 = current_price > ma_50
             
             # Volume confirmation (today's volume vs 20-day average)
-            vol_20_avg = hist['Volume'].tail(20).mean() if len(hist) >= 20 else hist['Volume'].mean()
-            current_volume = hist['Volume'].iloc[-1] if 'Volume' in hist.columns else 0
+            vol_20_avg = np.nanmean(volume[-20:])
+            current_volume = volume[-1]
             volume_ratio = (current_volume / vol_20_avg) if vol_20_avg > 0 else 1.0
             
             # MACD
-            macd = MACD(close=hist['Close'])
-            macd_line = macd.macd()
-            signal_line = macd.macd_signal()
-            has_macd = macd_line.iloc[-1] > signal_line.iloc[-1]
+            macd_value, macd_signal = macd_last(close)
+            has_macd = macd_value > macd_signal
             
             # Bollinger Bands
-            bb = BollingerBands(close=hist['Close'])
-            bb_lower = bb.bollinger_lband()
-            has_bb = current_price <= bb_lower.iloc[-1]
+            bb_lower, bb_upper = bb_last(close)
+            has_bb = current_price <= bb_lower
             
             # Williams %R
-            willr = WilliamsRIndicator(high=hist['High'], low=hist['Low'], close=hist['Close'])
-            willr_value = willr.williams_r()
-            has_willr = willr_value.iloc[-1] < -80
+            willr_value = willr_last(high, low, close)
+            has_willr = willr_value < -80
             
-            # Coppock Curve
-            roc1 = hist['Close'].pct_change(periods=14) * 100
-            roc2 = hist['Close'].pct_change(periods=11) * 100
-            coppock = (roc1 + roc2).rolling(window=10).mean()
-            has_coppock = coppock.iloc[-1] > 0 and coppock.iloc[-2] <= 0
+            # Coppock Curve: 10-day mean of ROC(14) + ROC(11)
+            # Only the last two curve values are used, so just those are computed.
+            # Gaps are forward-filled first, as pandas pct_change does.
+            fill_idx = np.maximum.accumulate(np.where(np.isnan(close), 0, np.arange(len(close))))
+            close_filled = close[fill_idx]
+            # roc_sum[k] is bar k + 14 of the last 25 bars, enough for 11 sums
+            close_filled = close_filled[-25:]
+            roc14 = (close_filled[14:] / close_filled[:-14] - 1) * 100
+            roc11 = (close_filled[14:] / close_filled[3:-11] - 1) * 100
+            roc_sum = roc14 + roc11
+            coppock_now = roc_sum[-10:].mean() if len(roc_sum) >= 10 else np.nan
+            coppock_prev = roc_sum[-11:-1].mean() if len(roc_sum) >= 11 else np.nan
+            has_coppock = coppock_now > 0 and coppock_prev <= 0
             
             # Ultimate Oscillator
-            ult = UltimateOscillator(high=hist['High'], low=hist['Low'], close=hist['Close'])
-            ult_value = ult.ultimate_oscillator()
-            has_ultimate = ult_value.iloc[-1] < 30
+            ult_value = uo_last(high, low, close)
+            has_ultimate = ult_value < 30
             
             # OBV (On-Balance Volume) - for buy confirmation
             # Calculate OBV: cumulative sum of volume * sign of price change
-            import numpy as np
-            price_change = hist['Close'].diff()
-            obv = (hist['Volume'] * np.sign(price_change)).cumsum()
+            # (a missing bar skips the sum but is itself NaN, as pandas cumsum does).
+            # Only the 20-day slope is used, so the last 21 bars are enough.
+            obv_close = close[-21:]
+            obv_step = np.empty(len(obv_close))
+            obv_step[0] = np.nan
+            obv_step[1:] = volume[-21:][1:] * np.sign(np.diff(obv_close))
+            obv = np.nancumsum(obv_step)
+            obv[np.isnan(obv_step)] = np.nan
             
             # OBV trend: compare 20-day slope of OBV vs price
             if len(obv) >= 20:
-                obv_now = obv.iloc[-1]
-                obv_20ago = obv.iloc[-20]
+                obv_now = obv[-1]
+                obv_20ago = obv[-20]
                 obv_slope = obv_now - obv_20ago
                 
-                price_now = hist['Close'].iloc[-1]
-                price_20ago = hist['Close'].iloc[-20]
+                price_now = close[-1]
+                price_20ago = close[-20]
                 price_slope = price_now - price_20ago
                 
                 # Determine OBV status
@@ -600,38 +745,18 @@ class MarketScanner:
                 obv_status = 'NEUTRAL'
             
             # RSI
-            rsi = RSIIndicator(close=hist['Close'])
-            rsi_value = rsi.rsi().iloc[-1]
+            rsi_series = rsi_kernel(close)
+            rsi_value = rsi_series[-1]
             
             # ==========================================
             # PRSI: PSAR on RSI (trend of RSI itself)
             # Better than raw RSI - shows if RSI is trending up or down
+            # Uses rolling 3-bar high/low of RSI so PSAR has a range to work with
             # ==========================================
-            rsi_series = rsi.rsi()
-            if len(rsi_series.dropna()) >= 20:
-                # Create rolling high/low for PSAR to have range to work with
-                rsi_high = rsi_series.rolling(3).max().fillna(rsi_series)
-                rsi_low = rsi_series.rolling(3).min().fillna(rsi_series)
-                
-                rsi_df = pd.DataFrame({
-                    'High': rsi_high,
-                    'Low': rsi_low,
-                    'Close': rsi_series
-                }).dropna()
-                
+            rsi_valid = rsi_series[~np.isnan(rsi_series)]
+            if len(rsi_valid) >= 20:
                 try:
-                    if len(rsi_df) >= 14:
-                        prsi_indicator = PSARIndicator(
-                            high=rsi_df['High'], 
-                            low=rsi_df['Low'], 
-                            close=rsi_df['Close'],
-                            step=0.02,
-                            max_step=0.2
-                        )
-                        prsi_up = prsi_indicator.psar_up()
-                        prsi_bullish = pd.notna(prsi_up.iloc[-1])
-                    else:
-                        prsi_bullish = rsi_value > 50  # Fallback
+                    prsi_bullish = prsi_kernel(rsi_valid, 0.02, 0.2)
                 except:
                     prsi_bullish = rsi_value > 50  # Fallback
             else:
@@ -642,15 +767,17 @@ class MarketScanner:
             # Overbought: Price > EMA8 + ATR
             # Oversold: Price < EMA8 - ATR
             # ==========================================
-            # Calculate ATR (14-period)
-            tr1 = hist['High'] - hist['Low']
-            tr2 = abs(hist['High'] - hist['Close'].shift(1))
-            tr3 = abs(hist['Low'] - hist['Close'].shift(1))
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(window=14).mean().iloc[-1]
+            # Calculate ATR (14-period) - only the last window's mean is needed,
+            # so just the last 15 bars (14 ranges plus the close before them)
+            atr_high, atr_low, atr_close = high[-15:], low[-15:], close[-15:]
+            prev_close = np.empty(len(atr_close))
+            prev_close[0] = np.nan
+            prev_close[1:] = atr_close[:-1]
+            tr = np.fmax(np.fmax(atr_high - atr_low, np.abs(atr_high - prev_close)), np.abs(atr_low - prev_close))
+            atr = tr[-14:].sum() / 14 if len(tr) >= 14 else np.nan
             
             # Calculate 8-day EMA
-            ema8 = hist['Close'].ewm(span=8, adjust=False).mean().iloc[-1]
+            ema8 = ema_last(close, 8)
             
             # Determine overextended status
             atr_upper = ema8 + atr
@@ -671,7 +798,7 @@ class MarketScanner:
             else:
                 atr_status = 'NORMAL'
             
-            atr_value = float(atr) if pd.notna(atr) else 0
+            atr_value = float(atr) if not math.isnan(atr) else 0
             atr_pct_from_ema = ((current_price - ema8) / ema8) * 100 if ema8 > 0 else 0
             
             # Signal Weight - now different for buys vs sells
@@ -687,12 +814,11 @@ class MarketScanner:
             if has_ultimate: signal_weight_buy += 15  # Ultimate oscillator oversold
             
             # Sell-focused weights (bearish signals)
-            macd_bearish = macd_line.iloc[-1] < signal_line.iloc[-1]
-            willr_overbought = willr_value.iloc[-1] > -20
-            bb_upper = bb.bollinger_hband()
-            at_bb_upper = current_price >= bb_upper.iloc[-1]
-            coppock_bearish = coppock.iloc[-1] < 0 and coppock.iloc[-2] >= 0
-            ultimate_overbought = ult_value.iloc[-1] > 70
+            macd_bearish = macd_value < macd_signal
+            willr_overbought = willr_value > -20
+            at_bb_upper = current_price >= bb_upper
+            coppock_bearish = coppock_now < 0 and coppock_prev >= 0
+            ultimate_overbought = ult_value > 70
             
             if macd_bearish: signal_weight_sell += 35
             if at_bb_upper: signal_weight_sell += 15
@@ -717,7 +843,7 @@ class MarketScanner:
                     entry_grade = 'B'
             
             # Day change
-            day_change = ((current_price - hist['Close'].iloc[-2]) / hist['Close'].iloc[-2] * 100) if len(hist) > 1 else 0
+            day_change = ((current_price - close[-2]) / close[-2] * 100) if len(close) > 1 else 0
             
             return {
                 'price': float(current_price),
@@ -738,12 +864,12 @@ class MarketScanner:
                 'has_willr': bool(has_willr),
                 'has_coppock': bool(has_coppock),
                 'has_ultimate': bool(has_ultimate),
-                'rsi': float(rsi_value) if pd.notna(rsi_value) else 50.0,
+                'rsi': float(rsi_value) if not math.isnan(rsi_value) else 50.0,
                 'prsi_bullish': bool(prsi_bullish),  # PSAR on RSI - is RSI trending up?
                 'atr': atr_value,
                 'atr_status': atr_status,  # OVERBOUGHT / OVERSOLD / NORMAL
                 'atr_pct': float(atr_pct_from_ema),  # % distance from EMA8
-                'ema8': float(ema8) if pd.notna(ema8) else current_price,
+                'ema8': float(ema8) if not math.isnan(ema8) else current_price,
                 'signal_weight': int(signal_weight),
                 'signal_weight_buy': int(signal_weight_buy),
                 'signal_weight_sell': int(signal_weight_sell),
@@ -752,52 +878,233 @@ class MarketScanner:
         except Exception as e:
             return None
     
-    def scan_ticker_full(self, ticker_symbol, source="Unknown", skip_market_cap_filter=False):
-        """Scan a single ticker with full data"""
-        import time
+    def _count_filter(self, reason):
+        """Bump a filter_reasons counter (safe to call from worker threads)"""
+        with self._filter_lock:
+            self.filter_reasons[reason] = self.filter_reasons.get(reason, 0) + 1
+    
+    def _record_exception(self, ticker_symbol, e):
+        """Count a scan exception and keep the first few messages for debugging"""
+        with self._filter_lock:
+            self.filter_reasons['exception'] = self.filter_reasons.get('exception', 0) + 1
+            first_exceptions = self.filter_reasons.setdefault('first_exceptions', [])
+            if len(first_exceptions) < 3:
+                first_exceptions.append(f"{ticker_symbol}: {type(e).__name__}: {str(e)[:100]}")
+    
+    def scan_ticker_full(self, ticker_symbol, source="Unknown", skip_market_cap_filter=False, mode='all', hist=None):
+        """Scan a single ticker with full data (see calculate_indicators for mode)"""
+        prepared = self.prepare_ticker(ticker_symbol, source=source, skip_market_cap_filter=skip_market_cap_filter,
+                                       hist=hist)
+        if prepared is None:
+            return None
+        return self.finish_ticker(prepared, self.calculate_indicators(prepared['hist'], mode))
+    
+    def scan_in_order(self, tickers, source, hists, mode='all', tag_ibd=True):
+        """Run scan_ticker_full over a ticker list, yielding (ticker, result, error) in list order.
         
-        # Normalize ticker format for Yahoo Finance
-        # BRK.B -> BRK-B, BF.B -> BF-B, etc.
-        original_ticker = ticker_symbol
+        Tickers are scanned concurrently (it's mostly network wait), with
+        price history taken from hists (see _download_bulk) where available.
+        The market cap filter is skipped - these are hand-picked lists.
+        With tag_ibd, tickers on IBD lists get ", IBD" added to their source.
+        """
+        def scan(ticker):
+            try:
+                ticker_source = source
+                if tag_ibd and ticker in self.ibd_stats:
+                    ticker_source = f"{source}, IBD"
+                
+                return self.scan_ticker_full(ticker, source=ticker_source, skip_market_cap_filter=True, mode=mode,
+                                             hist=hists.get(self.yahoo_symbol(ticker))), None
+            except Exception as e:
+                return None, e
+        
+        with ThreadPoolExecutor(max_workers=INFO_FETCH_WORKERS) as executor:
+            for ticker, (result, error) in zip(tickers, executor.map(scan, tickers)):
+                yield ticker, result, error
+    
+    @staticmethod
+    def yahoo_symbol(ticker_symbol):
+        """Normalize ticker format for Yahoo Finance: BRK.B -> BRK-B, BF.B -> BF-B, etc."""
         if '.' in ticker_symbol and not ticker_symbol.endswith('.L'):  # Don't change London stocks
-            ticker_symbol = ticker_symbol.replace('.', '-')
+            return ticker_symbol.replace('.', '-')
+        return ticker_symbol
+    
+    def _download_bulk(self, tickers, period="6mo"):
+        """Download price history for many tickers with batched yf.download calls.
+        
+        Returns {yahoo_symbol: hist_df} for every ticker that came back with
+        data. Recently cached histories are reused instead of downloaded.
+        Tickers missing from the result can still be fetched one at a
+        time by prepare_ticker().
+        """
+        import yfinance as yf
+        
+        symbols = []
+        hists = {}
+        stale = {}
+        for symbol in dict.fromkeys(self.yahoo_symbol(t) for t in tickers):
+            cached = cache_load('hist', symbol, HIST_CACHE_TTL)
+            if cached is not None:
+                hists[symbol] = cached
+                continue
+            cached = cache_load('hist', symbol, HIST_TOPUP_MAX_AGE)
+            if cached is not None and len(cached) >= 2:
+                stale[symbol] = cached
+            else:
+                symbols.append(symbol)
+        
+        if hists:
+            print(f"Using cached history for {len(hists)} stocks, downloading {len(symbols) + len(stale)}")
+        
+        if stale:
+            topped_up = self._topup_history(stale)
+            hists.update(topped_up)
+            symbols.extend(symbol for symbol in stale if symbol not in topped_up)
+            print(f"Topped up cached history for {len(topped_up)}/{len(stale)} stocks")
+        
+        for i in range(0, len(symbols), BULK_DOWNLOAD_CHUNK):
+            chunk = symbols[i:i + BULK_DOWNLOAD_CHUNK]
+            try:
+                # auto_adjust=True matches Ticker.history(), which the per-ticker path uses
+                data = yf.download(" ".join(chunk), period=period, group_by='ticker',
+                                   threads=True, auto_adjust=True, progress=False)
+            except Exception as e:
+                print(f"  ⚠️ Bulk download failed for {chunk[0]}..{chunk[-1]}: {str(e)[:80]}")
+                continue
+            
+            if data is None or data.empty:
+                continue
+            
+            for symbol in chunk:
+                if isinstance(data.columns, pd.MultiIndex):
+                    if symbol not in data.columns.get_level_values(0):
+                        continue
+                    hist = data[symbol]
+                elif len(chunk) == 1:
+                    hist = data
+                else:
+                    continue
+                
+                # Rows where this ticker didn't trade are all-NaN in the combined frame
+                hist = hist.dropna(how='all')
+                if not hist.empty:
+                    hist = _slim_history(hist)
+                    hists[symbol] = hist
+                    cache_store('hist', symbol, hist)
+            
+            chunk_count = i // BULK_DOWNLOAD_CHUNK + 1
+            if chunk_count % 25 == 0:
+                done = min(i + BULK_DOWNLOAD_CHUNK, len(symbols))
+                print(f"Downloaded: {done}/{len(symbols)} - With data: {len(hists)}")
+        
+        return hists
+    
+    def _topup_history(self, stale, period_months=6):
+        """Extend older cached histories with just the bars since they were saved.
+        
+        Downloads from the second-to-last cached bar, so the last (possibly
+        intraday) bar is replaced and the one before it is a complete bar to
+        check against. If that bar's close doesn't match - a split or dividend
+        changed the adjusted prices - the ticker is left out and gets a full
+        download instead. Returns {yahoo_symbol: hist_df} for the tickers updated.
+        """
+        import yfinance as yf
+        
+        # Tickers cached in the same run share a start date, so group on it
+        by_start = {}
+        for symbol, cached in stale.items():
+            by_start.setdefault(cached.index[-2], []).append(symbol)
+        
+        topped_up = {}
+        for start, group in by_start.items():
+            for i in range(0, len(group), BULK_DOWNLOAD_CHUNK):
+                chunk = group[i:i + BULK_DOWNLOAD_CHUNK]
+                try:
+                    data = yf.download(" ".join(chunk), start=start.strftime('%Y-%m-%d'), group_by='ticker',
+                                       threads=True, auto_adjust=True, progress=False)
+                except Exception:
+                    continue
+                
+                if data is None or data.empty:
+                    continue
+                
+                for symbol in chunk:
+                    if isinstance(data.columns, pd.MultiIndex):
+                        if symbol not in data.columns.get_level_values(0):
+                            continue
+                        fresh = data[symbol]
+                    elif len(chunk) == 1:
+                        fresh = data
+                    else:
+                        continue
+                    
+                    fresh = fresh.dropna(how='all')
+                    cached = stale[symbol]
+                    if fresh.empty or fresh.index.tz != cached.index.tz or fresh.index[0] != start:
+                        continue
+                    if not np.isclose(fresh['Close'].iloc[0], cached['Close'].iloc[-2], rtol=1e-4):
+                        continue
+                    
+                    hist = pd.concat([cached.iloc[:-2], _slim_history(fresh)])
+                    hist = hist[hist.index > hist.index[-1] - pd.DateOffset(months=period_months)]
+                    topped_up[symbol] = hist
+                    cache_store('hist', symbol, hist)
+        
+        return topped_up
+    
+    def prepare_ticker(self, ticker_symbol, source="Unknown", skip_market_cap_filter=False, hist=None):
+        """Fetch history and company info for a ticker and apply the market cap filter.
+        
+        Pass hist to reuse already-downloaded price history (see _download_bulk).
+        Returns a dict with everything finish_ticker() needs besides the
+        indicators, or None if the ticker was filtered out.
+        """
+        import yfinance as yf
         
-        # Add small delay to avoid rate limiting (0.1 seconds between requests)
-        time.sleep(0.1)
+        original_ticker = ticker_symbol
+        ticker_symbol = self.yahoo_symbol(ticker_symbol)
         
         try:
             ticker_obj = yf.Ticker(ticker_symbol)
             
+            if hist is None:
+                hist = cache_load('hist', ticker_symbol, HIST_CACHE_TTL)
+            
             # Try to get history with retry on rate limit
-            max_retries = 2
-            for attempt in range(max_retries):
-                try:
-                    hist = ticker_obj.history(period="6mo")
-                    break
-                except Exception as e:
-                    if 'rate' in str(e).lower() or '429' in str(e):
-                        if attempt < max_retries - 1:
-                            time.sleep(5)  # Wait 5 seconds on rate limit
-                            continue
-                    raise e
+            if hist is None:
+                max_retries = 2
+                for attempt in range(max_retries):
+                    try:
+                        hist = ticker_obj.history(period="6mo")
+                        break
+                    except Exception as e:
+                        if 'rate' in str(e).lower() or '429' in str(e):
+                            if attempt < max_retries - 1:
+                                time.sleep(5)  # Wait 5 seconds on rate limit
+                                continue
+                        raise e
+                if not hist.empty:
+                    hist = _slim_history(hist)
+                    cache_store('hist', ticker_symbol, hist)
             
             if hist.empty:
-                self.filter_reasons['empty_history'] = self.filter_reasons.get('empty_history', 0) + 1
+                self._count_filter('empty_history')
                 return None
             
             if len(hist) < 50:
-                self.filter_reasons['short_history'] = self.filter_reasons.get('short_history', 0) + 1
+                self._count_filter('short_history')
                 return None
             
             # Get company info
             try:
-                info = ticker_obj.info
+                info = self._cached_info(ticker_symbol, ticker_obj)
                 company_name = info.get('longName', ticker_symbol)
                 market_cap = info.get('marketCap', 0) or 0
+                dividend_yield = self.get_dividend_yield(info)
                 sector = info.get('sector', '') or ''
                 quote_type = info.get('quoteType', '') or ''
                 
-                # Growth estimates from yfinance
+                # Growth estimates from yfinance, kept as decimals (0.15 = 15%)
                 # Try multiple sources for growth data
                 
                 # EPS Growth: Calculate from forward vs trailing EPS if available
@@ -807,19 +1114,13 @@ class MarketScanner:
                 
                 if forward_eps and trailing_eps and trailing_eps > 0:
                     # Calculate implied forward growth
-                    eps_growth_pct = ((forward_eps - trailing_eps) / abs(trailing_eps)) * 100
-                elif earnings_growth_raw is not None:
-                    # Fallback to earningsGrowth (trailing)
-                    eps_growth_pct = earnings_growth_raw * 100
+                    eps_growth = (forward_eps - trailing_eps) / trailing_eps
                 else:
-                    eps_growth_pct = None
+                    # Fallback to earningsGrowth (trailing), may be None
+                    eps_growth = earnings_growth_raw
                 
                 # Revenue Growth: Use revenueGrowth if available
-                rev_growth_raw = info.get('revenueGrowth')
-                if rev_growth_raw is not None:
-                    rev_growth_pct = rev_growth_raw * 100
-                else:
-                    rev_growth_pct = None
+                rev_growth = info.get('revenueGrowth')
                 
                 # Short interest data for short candidates
                 # Priority: 1) CSV override, 2) yfinance, 3) FINRA (for OTC)
@@ -864,20 +1165,21 @@ class MarketScanner:
                                 short_ratio = finra_days
                 
             except Exception as e:
-                self.filter_reasons['info_error'] = self.filter_reasons.get('info_error', 0) + 1
+                self._count_filter('info_error')
                 company_name = ticker_symbol
                 market_cap = 0
+                dividend_yield = 0.0
                 sector = ''
                 quote_type = ''
-                eps_growth_pct = None
-                rev_growth_pct = None
+                eps_growth = None
+                rev_growth = None
                 short_percent = None
                 short_ratio = None
             
             # Market cap filter: uses self.min_market_cap (default $10B)
             if not skip_market_cap_filter:
                 if market_cap < self.min_market_cap:
-                    self.filter_reasons['market_cap'] = self.filter_reasons.get('market_cap', 0) + 1
+                    self._count_filter('market_cap')
                     return None
             
             # Detect REIT or Limited Partnership
@@ -894,33 +1196,56 @@ class MarketScanner:
                 ticker_symbol.endswith('LP')
             )
             
-            # Calculate indicators
-            indicators = self.calculate_indicators(hist)
-            if not indicators:
-                self.filter_reasons['indicators_failed'] = self.filter_reasons.get('indicators_failed', 0) + 1
-                return None
-            
-            # Get dividend yield - FIXED
-            dividend_yield = self.get_dividend_yield(ticker_obj)
-            
-            # Get IBD stats if available
-            ibd_data = self.ibd_stats.get(ticker_symbol, {})
-            
-            # Get IBD URL if available
-            ibd_url = self.get_ibd_url(ticker_symbol, info.get('exchange'))
-            
-            result = {
-                'ticker': original_ticker,  # Use original ticker format for display
-                'company': company_name if company_name else ticker_symbol,
+            return {
+                'hist': hist,
+                'ticker_symbol': ticker_symbol,
+                'original_ticker': original_ticker,
                 'source': source,
-                'dividend_yield': dividend_yield,
+                'exchange': info.get('exchange'),
+                'company_name': company_name,
                 'market_cap': market_cap,
+                'dividend_yield': dividend_yield,
                 'is_reit': is_reit,
                 'is_lp': is_lp,
-                'eps_growth': eps_growth_pct,
-                'rev_growth': rev_growth_pct,
-                'short_percent': short_percent,  # Short interest as % of float
-                'short_ratio': short_ratio,      # Days to cover
+                'eps_growth': eps_growth,
+                'rev_growth': rev_growth,
+                'short_percent': short_percent,
+                'short_ratio': short_ratio,
+            }
+            
+        except Exception as e:
+            self._record_exception(ticker_symbol, e)
+            return None
+    
+    def finish_ticker(self, prepared, indicators):
+        """Combine prepared ticker data with its indicators into a scan result"""
+        ticker_symbol = prepared['ticker_symbol']
+        
+        if not indicators:
+            self._count_filter('indicators_failed')
+            return None
+        
+        try:
+            # Get IBD stats and URL if available (most tickers aren't on an IBD list)
+            ibd_data = self.ibd_stats.get(ticker_symbol)
+            if ibd_data:
+                ibd_url = self.get_ibd_url(ticker_symbol, prepared['exchange'])
+            else:
+                ibd_data, ibd_url = _EMPTY_IBD, None
+            
+            company_name = prepared['company_name']
+            result = {
+                'ticker': prepared['original_ticker'],  # Use original ticker format for display
+                'company': company_name if company_name else ticker_symbol,
+                'source': prepared['source'],
+                'dividend_yield': prepared['dividend_yield'],
+                'market_cap': prepared['market_cap'],
+                'is_reit': prepared['is_reit'],
+                'is_lp': prepared['is_lp'],
+                'eps_growth': prepared['eps_growth'],  # Decimal, e.g. 0.15 = 15%
+                'rev_growth': prepared['rev_growth'],  # Decimal
+                'short_percent': prepared['short_percent'],  # Short interest as % of float
+                'short_ratio': prepared['short_ratio'],      # Days to cover
                 'composite': ibd_data.get('composite', 'N/A'),
                 'eps': ibd_data.get('eps', 'N/A'),
                 'rs': ibd_data.get('rs', 'N/A'),
@@ -932,16 +1257,92 @@ class MarketScanner:
             return result
             
         except Exception as e:
-            self.filter_reasons['exception'] = self.filter_reasons.get('exception', 0) + 1
-            # Capture first few error messages for debugging
-            if 'first_exceptions' not in self.filter_reasons:
-                self.filter_reasons['first_exceptions'] = []
-            if len(self.filter_reasons['first_exceptions']) < 3:
-                self.filter_reasons['first_exceptions'].append(f"{ticker_symbol}: {type(e).__name__}: {str(e)[:100]}")
+            self._record_exception(ticker_symbol, e)
             return None
     
-    def scan_with_priority(self, include_adr=False):
-        """Scan watchlist first, then broad market"""
+    def calculate_indicators_many(self, hists, mode='all'):
+        """Calculate indicators for a list of histories, in parallel when worthwhile.
+        
+        For long/short scans, PSAR for the whole batch is computed in one
+        kernel call first, and wrong-trend tickers get their minimal result
+        straight from that. Only the rest need the full indicator set.
+        
+        Indicator math is pure CPU work, so it is fanned out over a process
+        pool rather than threads. Falls back to a serial loop for small
+        batches or if the pool can't be started.
+        """
+        results = [None] * len(hists)
+        pending = list(range(len(hists)))
+        
+        if mode in ('long', 'short') and hists:
+            pending = []
+            for i, screened in enumerate(self._psar_screen(hists, mode)):
+                if screened is None:
+                    pending.append(i)
+                else:
+                    results[i] = screened
+        
+        todo = [hists[i] for i in pending]
+        if len(todo) < INDICATOR_POOL_MIN_BATCH:
+            computed = [self.calculate_indicators(hist, mode) for hist in todo]
+        else:
+            try:
+                blocks = [_history_block(hist) for hist in todo]
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+                    computed = list(pool.map(_compute_one, blocks, repeat(mode), chunksize=32))
+            except Exception as e:
+                print(f"  ⚠️ Indicator process pool failed ({type(e).__name__}), computing serially")
+                computed = [self.calculate_indicators(hist, mode) for hist in todo]
+        
+        for i, indicators in zip(pending, computed):
+            results[i] = indicators
+        return results
+    
+    @staticmethod
+    def _psar_screen(hists, mode):
+        """Batched PSAR trend check for a long/short scan.
+        
+        Returns one entry per history: the minimal result for wrong-trend
+        tickers, or None where the full calculation is still needed.
+        """
+        try:
+            lengths = [len(hist) for hist in hists]
+            offsets = np.zeros(len(hists) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            high = np.concatenate([hist['High'].to_numpy(dtype=np.float64) for hist in hists])
+            low = np.concatenate([hist['Low'].to_numpy(dtype=np.float64) for hist in hists])
+            close = np.concatenate([hist['Close'].to_numpy(dtype=np.float64) for hist in hists])
+            psar_last, bullish = psar_last_batch(high, low, close, offsets)
+            
+            # Last close per ticker (NaN for empty histories)
+            last_idx = offsets[1:] - 1
+            price = np.full(len(hists), np.nan)
+            has_bars = last_idx >= offsets[:-1]
+            price[has_bars] = close[last_idx[has_bars]]
+        except Exception:
+            # Anything odd about the batch - let the per-ticker path handle it
+            return [None] * len(hists)
+        
+        # Same rules as psar_distance(), for the whole batch at once
+        with np.errstate(invalid='ignore', divide='ignore'):
+            raw_distance = np.abs((price - psar_last) / price) * 100
+        valid = (psar_last > 0) & (price > 0)
+        distance = np.where(valid, np.where(bullish, raw_distance, -raw_distance), 0.0)
+        
+        wrong = ~bullish if mode == 'long' else bullish
+        skip = wrong & ~np.isnan(price) & ~np.isnan(psar_last)
+        
+        return [
+            MarketScanner.trend_only_result(price[k], psar_last[k], bullish[k], distance[k]) if skip[k] else None
+            for k in range(len(hists))
+        ]
+    
+    def scan_with_priority(self, include_adr=False, mode='all'):
+        """Scan watchlist first, then broad market.
+        
+        mode='short' (or 'long') only fully analyzes tickers in that PSAR trend,
+        and leaves broad market tickers in the other trend out of the results.
+        """
         
         print("\n" + "="*70)
         print(" "*20 + "MARKET-WIDE PSAR SCANNER")
@@ -956,34 +1357,29 @@ class MarketScanner:
         
         watchlist = self.load_custom_watchlist()
         watchlist_results = []
+        watchlist_hists = self._download_bulk(watchlist)
         
-        for ticker in watchlist:
+        # Scanned concurrently, but reported in watchlist order
+        for ticker, result, error in self.scan_in_order(watchlist, "Watchlist", watchlist_hists, mode=mode):
             print(f"\n📍 Scanning priority ticker: {ticker}")
             
-            try:
-                # Check if this ticker is on IBD lists
-                source = "Watchlist"
-                if ticker in self.ibd_stats:
-                    source = "Watchlist, IBD"
+            if error is not None:
+                print(f"  ✗ ERROR: {str(error)}")
+            elif result:
+                result['is_watchlist'] = True
+                watchlist_results.append(result)
                 
-                result = self.scan_ticker_full(ticker, source=source, skip_market_cap_filter=True)
-                if result:
-                    result['is_watchlist'] = True
-                    watchlist_results.append(result)
-                    
-                    if result['psar_bullish']:
-                        print(f"  ✓ PSAR BUY")
-                        print(f"    Distance: {result['psar_distance']:.2f}%")
-                        print(f"    Weight: {result['signal_weight']}")
-                        print(f"    Price: ${result['price']:.2f}")
-                        if result['dividend_yield'] > 0:
-                            print(f"    Dividend: {result['dividend_yield']:.2f}%")
-                    else:
-                        print(f"  ○ PSAR SELL")
+                if result['psar_bullish']:
+                    print(f"  ✓ PSAR BUY")
+                    print(f"    Distance: {result['psar_distance']:.2f}%")
+                    print(f"    Weight: {result['signal_weight']}")
+                    print(f"    Price: ${result['price']:.2f}")
+                    if result['dividend_yield'] > 0:
+                        print(f"    Dividend: {result['dividend_yield']:.2f}%")
                 else:
-                    print(f"  ✗ No data available")
-            except Exception as e:
-                print(f"  ✗ ERROR: {str(e)}")
+                    print(f"  ○ PSAR SELL")
+            else:
+                print(f"  ✗ No data available")
         
         print(f"\n✓ Watchlist scan complete: {len(watchlist_results)}/{len(watchlist)} successful")
         
@@ -995,40 +1391,78 @@ class MarketScanner:
         all_tickers = self.load_all_tickers_with_sources(include_adr=include_adr)
         
         # Remove watchlist tickers
-        for ticker in watchlist:
-            if ticker in all_tickers:
-                del all_tickers[ticker]
+        watchlist_set = frozenset(watchlist)
+        all_tickers = {t: sources for t, sources in all_tickers.items() if t not in watchlist_set}
         
         print(f"Scanning {len(all_tickers)} stocks from broad market...")
         print(f"This will take 20-30 minutes...\n")
         
         broad_market_results = []
+        prepared_list = []
         progress_count = 0
         error_count = 0
         no_data_count = 0
         market_cap_filtered = 0
         first_error = None
         
-        for ticker, source in all_tickers.items():
+        # Price history comes down in batches; anything missing is retried per ticker
+        print(f"Downloading price history in batches of {BULK_DOWNLOAD_CHUNK}...")
+        bulk_hists = self._download_bulk(list(all_tickers))
+        
+        if mode in ('long', 'short'):
+            # The caller drops wrong-trend tickers, so settle their PSAR trend from
+            # the downloaded history first and skip their company info fetch
+            screen_tickers = [t for t in all_tickers if self.yahoo_symbol(t) in bulk_hists]
+            screened = self._psar_screen([bulk_hists[self.yahoo_symbol(t)] for t in screen_tickers], mode)
+            wrong_trend = {t for t, trend_only in zip(screen_tickers, screened) if trend_only is not None}
+            all_tickers = {t: sources for t, sources in all_tickers.items() if t not in wrong_trend}
+            print(f"Skipping {len(wrong_trend)} stocks not in a PSAR {'buy' if mode == 'long' else 'sell'} trend")
+        
+        def prepare(item):
+            ticker, sources = item
             try:
                 # Skip market cap filter for IBD stocks
-                skip_cap = 'IBD' in source
-                result = self.scan_ticker_full(ticker, source=source, skip_market_cap_filter=skip_cap)
-                if result:
-                    result['is_watchlist'] = False
-                    broad_market_results.append(result)
+                skip_cap = 'IBD' in sources
+                prepared = self.prepare_ticker(ticker, source=self.format_sources(sources),
+                                               skip_market_cap_filter=skip_cap,
+                                               hist=bulk_hists.get(self.yahoo_symbol(ticker)))
+                return prepared, None
+            except Exception as e:
+                return None, f"{ticker}: {str(e)}"
+        
+        # Report progress on 5% boundaries rather than every N tickers
+        progress_step = max(1, len(all_tickers) // 20)
+        
+        # Fetch company info concurrently (pure network wait); indicator math
+        # happens in one parallel batch below
+        with ThreadPoolExecutor(max_workers=INFO_FETCH_WORKERS) as pool:
+            for prepared, error in pool.map(prepare, all_tickers.items()):
+                if error:
+                    error_count += 1
+                    if first_error is None:
+                        first_error = error
+                    continue
+                
+                if prepared:
+                    prepared_list.append(prepared)
                 else:
                     no_data_count += 1
                 
                 progress_count += 1
-                if progress_count % 50 == 0:
+                if progress_count % progress_step == 0:
                     elapsed_pct = progress_count / len(all_tickers) * 100
-                    print(f"Progress: {progress_count}/{len(all_tickers)} ({elapsed_pct:.1f}%) - Found: {len(broad_market_results)}, No data: {no_data_count}, Errors: {error_count}")
-            except Exception as e:
-                error_count += 1
-                if first_error is None:
-                    first_error = f"{ticker}: {str(e)}"
-                continue
+                    print(f"Progress: {progress_count}/{len(all_tickers)} ({elapsed_pct:.1f}%) - Fetched: {len(prepared_list)}, No data: {no_data_count}, Errors: {error_count}")
+        
+        print(f"\nCalculating indicators for {len(prepared_list)} stocks...")
+        indicators_list = self.calculate_indicators_many([p['hist'] for p in prepared_list], mode)
+        
+        for prepared, indicators in zip(prepared_list, indicators_list):
+            result = self.finish_ticker(prepared, indicators)
+            if result:
+                result['is_watchlist'] = False
+                broad_market_results.append(result)
+            else:
+                no_data_count += 1
         
         print(f"\n✓ Broad market scan complete: {len(broad_market_results)} signals found")
         print(f"   No data/filtered: {no_data_count}, Errors: {error_count}")
@@ -1090,36 +1524,35 @@ class MarketScanner:
         
         all_results = []
         progress_count = 0
+        buys = 0
+        sells = 0
+        hists = self._download_bulk(mystocks)
         
-        for ticker in mystocks:
-            try:
-                # Check if this ticker is on IBD lists
-                source = "Portfolio"
-                if ticker in self.ibd_stats:
-                    source = "Portfolio, IBD"
+        for ticker, result, error in self.scan_in_order(mystocks, "Portfolio", hists):
+            if error is not None:
+                print(f"  {ticker}: ERROR - {str(error)}")
+                continue
+            
+            if result:
+                result['is_watchlist'] = True  # Treat all as watchlist for display
+                all_results.append(result)
                 
-                result = self.scan_ticker_full(ticker, source=source, skip_market_cap_filter=True)
-                if result:
-                    result['is_watchlist'] = True  # Treat all as watchlist for display
-                    all_results.append(result)
-                    
-                    status = "BUY" if result['psar_bullish'] else "SELL"
-                    print(f"  {ticker}: {status} (Dist: {result['psar_distance']:+.2f}%, Wt: {result['signal_weight']})")
+                if result['psar_bullish']:
+                    buys += 1
                 else:
-                    print(f"  {ticker}: No data")
-                
-                progress_count += 1
-                if progress_count % 25 == 0:
-                    print(f"Progress: {progress_count}/{len(mystocks)}")
-            except Exception as e:
-                print(f"  {ticker}: ERROR - {str(e)}")
-                continue
+                    sells += 1
+                status = "BUY" if result['psar_bullish'] else "SELL"
+                print(f"  {ticker}: {status} (Dist: {result['psar_distance']:+.2f}%, Wt: {result['signal_weight']})")
+            else:
+                print(f"  {ticker}: No data")
+            
+            progress_count += 1
+            if progress_count % 25 == 0:
+                print(f"Progress: {progress_count}/{len(mystocks)}")
         
         print(f"\n✓ Portfolio scan complete: {len(all_results)}/{len(mystocks)} successful")
         
-        # Count buys vs sells
-        buys = len([r for r in all_results if r['psar_bullish']])
-        sells = len([r for r in all_results if not r['psar_bullish']])
+        # Buys vs sells were tallied in the scan loop above
         print(f"  🟢 PSAR Buys: {buys}")
         print(f"  🔴 PSAR Sells: {sells}")
         
@@ -1130,12 +1563,12 @@ class MarketScanner:
             'ticker_issues': self.ticker_issues
         }
     
-    def run(self, mystocks_only=False, include_adr=False):
+    def run(self, mystocks_only=False, include_adr=False, mode='all'):
         """Main scanner execution"""
         if mystocks_only:
             results = self.scan_mystocks_only()
         else:
-            results = self.scan_with_priority(include_adr=include_adr)
+            results = self.scan_with_priority(include_adr=include_adr, mode=mode)
         self.results = results
         
         print("\n" + "="*60)
@@ -1185,27 +1618,22 @@ class MarketScanner:
         print(f"\nScanning {len(friends_stocks)} friend's stocks...")
         
         all_results = []
+        hists = self._download_bulk(friends_stocks)
         
-        for ticker in friends_stocks:
-            try:
-                # Check if this ticker is on IBD lists
-                source = "Friends"
-                if ticker in self.ibd_stats:
-                    source = "Friends, IBD"
-                
-                result = self.scan_ticker_full(ticker, source=source, skip_market_cap_filter=True)
-                if result:
-                    result['is_watchlist'] = True
-                    all_results.append(result)
-                    
-                    status = "BUY" if result['psar_bullish'] else "SELL"
-                    zone = result.get('psar_zone', 'UNKNOWN')
-                    print(f"  {ticker}: {zone} (PSAR: {result['psar_distance']:+.2f}%, Mom: {result['psar_momentum']})")
-                else:
-                    print(f"  {ticker}: No data")
-            except Exception as e:
-                print(f"  {ticker}: ERROR - {str(e)}")
+        for ticker, result, error in self.scan_in_order(friends_stocks, "Friends", hists):
+            if error is not None:
+                print(f"  {ticker}: ERROR - {str(error)}")
                 continue
+            
+            if result:
+                result['is_watchlist'] = True
+                all_results.append(result)
+                
+                status = "BUY" if result['psar_bullish'] else "SELL"
+                zone = result.get('psar_zone', 'UNKNOWN')
+                print(f"  {ticker}: {zone} (PSAR: {result['psar_distance']:+.2f}%, Mom: {result['psar_momentum']})")
+            else:
+                print(f"  {ticker}: No data")
         
         print(f"\n✓ Friends scan complete: {len(all_results)}/{len(friends_stocks)} successful")
         
@@ -1254,36 +1682,41 @@ class MarketScanner:
         print(f"\nScanning {len(short_stocks)} potential short candidates...")
         
         all_results = []
+        sells_count = 0
+        high_si_count = 0
+        hists = self._download_bulk(short_stocks)
         
-        for ticker in short_stocks:
-            try:
-                result = self.scan_ticker_full(ticker, source="Shorts", skip_market_cap_filter=True)
-                if result:
-                    result['is_watchlist'] = True
-                    all_results.append(result)
-                    
-                    zone = result.get('psar_zone', 'UNKNOWN')
-                    short_pct = result.get('short_percent')
-                    short_pct_str = f"{short_pct:.1f}%" if short_pct else "N/A"
-                    
-                    # Flag squeeze risk
-                    squeeze_warn = " ⚠️SQUEEZE RISK" if short_pct and short_pct > 20 else ""
-                    
-                    print(f"  {ticker}: {zone} (PSAR: {result['psar_distance']:+.2f}%, SI: {short_pct_str}){squeeze_warn}")
-                else:
-                    print(f"  {ticker}: No data")
-            except Exception as e:
-                print(f"  {ticker}: ERROR - {str(e)}")
+        for ticker, result, error in self.scan_in_order(short_stocks, "Shorts", hists, tag_ibd=False):
+            if error is not None:
+                print(f"  {ticker}: ERROR - {str(error)}")
                 continue
+            
+            if result:
+                result['is_watchlist'] = True
+                all_results.append(result)
+                
+                zone = result.get('psar_zone', 'UNKNOWN')
+                short_pct = result.get('short_percent')
+                short_pct_str = f"{short_pct:.1f}%" if short_pct else "N/A"
+                
+                if not result['psar_bullish']:
+                    sells_count += 1
+                
+                # Flag squeeze risk
+                is_high_si = bool(short_pct and short_pct > 20)
+                if is_high_si:
+                    high_si_count += 1
+                squeeze_warn = " ⚠️SQUEEZE RISK" if is_high_si else ""
+                
+                print(f"  {ticker}: {zone} (PSAR: {result['psar_distance']:+.2f}%, SI: {short_pct_str}){squeeze_warn}")
+            else:
+                print(f"  {ticker}: No data")
         
         print(f"\n✓ Shorts scan complete: {len(all_results)}/{len(short_stocks)} successful")
         
-        # Analyze short candidates
-        sells = [r for r in all_results if not r['psar_bullish']]
-        high_si = [r for r in all_results if r.get('short_percent') and r.get('short_percent') > 20]
-        
-        print(f"  🔴 In SELL zone: {len(sells)}")
-        print(f"  ⚠️ High short interest (>20%): {len(high_si)}")
+        # Short candidate counts were tallied in the scan loop above
+        print(f"  🔴 In SELL zone: {sells_count}")
+        print(f"  ⚠️ High short interest (>20%): {high_si_count}")
         
         return {
             'watchlist_results': all_results,
@@ -1292,6 +1725,11 @@ class MarketScanner:
             'ticker_issues': self.ticker_issues
         }
 
+def _compute_one(block, mode='all'):
+    """Process pool worker: indicators for one ticker's _history_block()"""
+    return MarketScanner.calculate_indicators_block(block, mode)
+
+
 if __name__ == "__main__":
     import sys
     import argparse
@@ -1307,6 +1745,7 @@ if __name__ == "__main__":
     parser.add_argument('-rev', type=float, default=None, help='Minimum revenue growth %% (e.g., -rev 15 for 15%% growth)')
     parser.add_argument('-mc', type=float, default=None, help='Minimum market cap in billions (e.g., -mc 1 for $1B+, default is 10)')
     parser.add_argument('-adr', action='store_true', help='Include international ADRs (American Depositary Receipts)')
+    parser.add_argument('-nocc', action='store_true', help='Skip covered call suggestions (no options lookups) in -mystocks/-friends reports')
     
     args = parser.parse_args()
     
@@ -1327,47 +1766,47 @@ if __name__ == "__main__":
         if eps_min is None and rev_min is None:
             return results
         
-        filtered = []
-        eps_available = 0
-        rev_available = 0
+        # Thresholds are given in percent; growth values are stored as decimals
+        eps_min_dec = eps_min / 100 if eps_min is not None else None
+        rev_min_dec = rev_min / 100 if rev_min is not None else None
+        
+        # Columnar view of the results so the filters are vectorized masks
+        all_results = results['all_results']
+        frame = MarketScanner.results_frame(all_results, ['eps_growth', 'rev_growth', 'is_watchlist'])
+        
+        # Track data availability
+        has_eps = frame['eps_growth'].notna()
+        has_rev = frame['rev_growth'].notna()
+        eps_available = int(has_eps.sum())
+        rev_available = int(has_rev.sum())
+        
+        # EPS filter: only reject if data EXISTS and is below threshold
+        eps_ok = pd.Series(True, index=frame.index)
         eps_passed = 0
+        if eps_min is not None:
+            eps_meets = has_eps & (frame['eps_growth'] >= eps_min_dec)
+            eps_passed = int(eps_meets.sum())
+            eps_ok = ~has_eps | eps_meets
+        
+        # Revenue filter: only reject if data EXISTS and is below threshold
+        rev_ok = pd.Series(True, index=frame.index)
         rev_passed = 0
+        if rev_min is not None:
+            rev_meets = has_rev & (frame['rev_growth'] >= rev_min_dec)
+            rev_passed = int(rev_meets.sum())
+            rev_ok = ~has_rev | rev_meets
         
-        for r in results['all_results']:
-            eps_ok = True
-            rev_ok = True
-            
-            # Track data availability
-            has_eps = r.get('eps_growth') is not None
-            has_rev = r.get('rev_growth') is not None
-            
-            if has_eps:
-                eps_available += 1
-            if has_rev:
-                rev_available += 1
-            
-            # EPS filter: only reject if data EXISTS and is below threshold
-            if eps_min is not None and has_eps:
-                if r.get('eps_growth') >= eps_min:
-                    eps_passed += 1
-                else:
-                    eps_ok = False
-            
-            # Revenue filter: only reject if data EXISTS and is below threshold  
-            if rev_min is not None and has_rev:
-                if r.get('rev_growth') >= rev_min:
-                    rev_passed += 1
-                else:
-                    rev_ok = False
-            
-            if eps_ok and rev_ok:
-                filtered.append(r)
+        keep = (eps_ok & rev_ok).to_numpy()
+        is_watchlist = frame['is_watchlist'].fillna(False).astype(bool).to_numpy()
+        filtered = [r for r, k in zip(all_results, keep) if k]
+        watchlist_filtered = [r for r, k in zip(all_results, keep & is_watchlist) if k]
+        broad_filtered = [r for r, k in zip(all_results, keep & ~is_watchlist) if k]
         
         # Update results with filtered list
-        original_count = len(results['all_results'])
+        original_count = len(all_results)
         results['all_results'] = filtered
-        results['watchlist_results'] = [r for r in filtered if r.get('is_watchlist', False)]
-        results['broad_market_results'] = [r for r in filtered if not r.get('is_watchlist', False)]
+        results['watchlist_results'] = watchlist_filtered
+        results['broad_market_results'] = broad_filtered
         
         filter_desc = []
         if eps_min is not None:
@@ -1401,23 +1840,18 @@ if __name__ == "__main__":
         position_values = {}
         if os.path.exists('mypositions.csv'):
             try:
-                import csv
-                with open('mypositions.csv', 'r') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        symbol = row.get('Symbol', '').strip().upper()
-                        try:
-                            value = float(row.get('Value', 0))
-                            position_values[symbol] = value
-                        except:
-                            pass
+                df = pd.read_csv('mypositions.csv', usecols=['Symbol', 'Value']).dropna(subset=['Symbol'])
+                df['Symbol'] = df['Symbol'].astype(str).str.strip().str.upper()
+                df['Value'] = pd.to_numeric(df['Value'], errors='coerce')
+                df = df.dropna(subset=['Value'])
+                position_values = dict(zip(df['Symbol'], df['Value'].astype(float)))
                 print(f"✓ Loaded {len(position_values)} position values from mypositions.csv")
             except Exception as e:
                 print(f"⚠️ Could not load mypositions.csv: {e}")
         
         print("\nGenerating portfolio report...")
         from portfolio_report import PortfolioReport
-        report = PortfolioReport(results, position_values)
+        report = PortfolioReport(results, position_values, include_covered_calls=not args.nocc)
         report.send_email(additional_email=args.email)
         
     elif args.friends:
@@ -1433,7 +1867,8 @@ if __name__ == "__main__":
         
         print("\nGenerating friends report...")
         from portfolio_report import PortfolioReport
-        report = PortfolioReport(results, position_values={}, is_friends_mode=True)
+        report = PortfolioReport(results, position_values={}, is_friends_mode=True,
+                                 include_covered_calls=not args.nocc)
         
         # Use custom title if provided
         custom_title = args.title if args.title else "Friends Portfolio"
@@ -1458,8 +1893,9 @@ if __name__ == "__main__":
             print(f"  Upload to Google Sheets for GOOGLEFINANCE auto-updates")
     
     elif args.shortscan:
-        # Full market scan for short candidates
-        results = scanner.run(mystocks_only=False, include_adr=args.adr)
+        # Full market scan for short candidates (BUY-trend stocks are dropped below,
+        # so skip their full indicator calculation)
+        results = scanner.run(mystocks_only=False, include_adr=args.adr, mode='short')
         
         # Apply growth filters if specified
         if args.eps is not None or args.rev is not None:
@@ -4,12 +4,15 @@ Supports both -mystocks mode (with position values) and -friends mode (without)
 """
 
 import os
-import json
-import smtplib
+import heapq
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import datetime, timedelta
-import yfinance as yf
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from cache_utils import cache_load, cache_store, update_exit_history
+from report_styles import zone_color, zone_emoji, momentum_display
+from smtp_utils import send_message
 
 # Import IBD utilities for formatting
 try:
@@ -17,13 +20,98 @@ try:
 except ImportError:
     format_ibd_ticker = None
 
+# Option chain lookups are pure network wait, so they run concurrently
+OPTIONS_FETCH_WORKERS = 16
+# Expirations and call chains are reused for a while (see cache_utils)
+OPTIONS_CACHE_TTL = 15 * 60
+NO_OPTIONS_CACHE_TTL = 24 * 3600  # Tickers without listed options rarely gain them
+# Background thread for the CBOE sentiment fetch, started once a body is actually being built
+_SENTIMENT_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+# OBV and indicator-check cells for the per-row precompute
+OBV_DISPLAY = {'CONFIRM': "<span style='color:#27ae60;'>🟢</span>",
+               'DIVERGE': "<span style='color:#c0392b;'>🔴</span>"}
+OBV_NEUTRAL_DISPLAY = "<span style='color:#f39c12;'>🟡</span>"
+INDICATOR_YES = "<span style='color:#27ae60;'>✓</span>"
+INDICATOR_NO = "<span style='color:#e74c3c;'>✗</span>"
+
+# Portfolio report <head>: zone section banners and table styling
+HTML_HEAD = """
+        <html><head><style>
+            body { font-family: Arial, sans-serif; font-size: 12px; }
+            table { border-collapse: collapse; width: 100%; margin: 10px 0; }
+            th { padding: 8px; text-align: left; font-size: 11px; }
+            td { padding: 6px; border-bottom: 1px solid #ddd; font-size: 11px; }
+            tr:hover { background-color: #f5f5f5; }
+            .section-strongbuy { background-color: #1e8449; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
+            .section-buy { background-color: #27ae60; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
+            .section-neutral { background-color: #f39c12; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
+            .section-weak { background-color: #e67e22; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
+            .section-sell { background-color: #c0392b; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
+            .section-blue { background-color: #2980b9; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
+            .section-gray { background-color: #7f8c8d; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
+            .section-red { background-color: #c0392b; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
+            .th-strongbuy { background-color: #1e8449; color: white; }
+            .th-buy { background-color: #27ae60; color: white; }
+            .th-neutral { background-color: #f39c12; color: white; }
+            .th-weak { background-color: #e67e22; color: white; }
+            .th-sell { background-color: #c0392b; color: white; }
+            .th-blue { background-color: #2980b9; color: white; }
+            .th-red { background-color: #c0392b; color: white; }
+            .th-gray { background-color: #7f8c8d; color: white; }
+            .alert-box { padding: 10px; margin: 10px 0; border-radius: 5px; }
+            .alert-green { background-color: #d4edda; border-left: 4px solid #27ae60; }
+            .alert-red { background-color: #f8d7da; border-left: 4px solid #c0392b; }
+            .summary-box { background-color: #ecf0f1; padding: 15px; margin: 15px 0; border-radius: 5px; }
+        </style></head><body>
+        """
+
+
+def _fetch_cboe_sentiment():
+    """CBOE put/call sentiment text (Selenium); import errors surface when the result is read"""
+    from cboe import get_cboe_ratios_and_analyze
+    return get_cboe_ratios_and_analyze()
+
+
+def _zone_table_header(*columns):
+    """Opening <table> and header row template; only zone_class is left to fill in"""
+    cells = ''.join(f"<th class='th-{{zone_class}}'>{col}</th>" for col in columns)
+    return f"<table><tr>{cells}</tr>"
+
+
+# Header rows for the _build_*table helpers, assembled once
+ZONE_TABLE_HEADERS = {
+    'with_indicators': _zone_table_header('Ticker', 'Value', 'Price', 'PSAR%', 'Mom', 'ATR', 'PRSI', 'OBV', 'IR', 'Indicators'),
+    'with_value': _zone_table_header('Ticker', 'Value', 'Price', 'PSAR%', 'Mom', 'ATR', 'PRSI', 'OBV', 'IR'),
+    'no_value': _zone_table_header('Ticker', 'Price', 'PSAR%', 'Mom', 'ATR', 'PRSI', 'OBV', 'IR'),
+}
+# Matching row templates, filled straight from a result dict with format_map
+# (the _-prefixed cells are rendered once per row by _categorize)
+ZONE_TABLE_ROWS = {
+    'with_indicators': ("<tr><td><strong>{_ticker_html}</strong></td><td><strong>{_val_str}</strong></td><td>{_price_str}</td>"
+                        "<td style='color:{_zone_color};font-weight:bold;'>{psar_distance:+.1f}%</td><td>{_mom_html}</td>"
+                        "<td>{_atr_html}</td><td>{_prsi_html}</td><td>{_obv_html}</td><td>{signal_weight}</td>"
+                        "<td style='font-size:10px;'>{_ind_html}</td></tr>"),
+    'with_value': ("<tr><td><strong>{_ticker_html}</strong></td><td>{_val_str}</td><td>{_price_str}</td>"
+                   "<td style='color:{_zone_color};'>{psar_distance:+.1f}%</td><td>{_mom_html}</td>"
+                   "<td>{_atr_html}</td><td>{_prsi_html}</td><td>{_obv_html}</td><td>{signal_weight}</td></tr>"),
+    'no_value': ("<tr><td><strong>{_ticker_html}</strong></td><td>{_price_str}</td>"
+                 "<td style='color:{_zone_color};'>{psar_distance:+.1f}%</td><td>{_mom_html}</td>"
+                 "<td>{_atr_html}</td><td>{_prsi_html}</td><td>{_obv_html}</td><td>{signal_weight}</td></tr>"),
+}
+
 
 class PortfolioReport:
-    def __init__(self, scan_results, position_values=None, is_friends_mode=False):
+    def __init__(self, scan_results, position_values=None, is_friends_mode=False, include_covered_calls=True):
+        self._sentiment_future = None  # Submitted by _start_sentiment_fetch
+        self.report_time = datetime.now()  # One timestamp for the exit history, body and subject
+        
         self.all_results = scan_results['all_results']
         self.position_values = position_values or {}
         self.is_friends_mode = is_friends_mode
+        self.include_covered_calls = include_covered_calls  # False skips every option chain lookup
         self.report_title = "Portfolio"
+        self._tickers = {}  # yf.Ticker per symbol, created on first network use
         
         # Only add position values if we have them
         for r in self.all_results:
@@ -31,30 +119,14 @@ class PortfolioReport:
         
         # Only track exits for mystocks mode (not friends)
         if not is_friends_mode:
-            self.exit_history = self.load_exit_history()
-            self.recent_exits = self.update_exit_history()
+            self.exit_history, self.recent_exits = update_exit_history(
+                self.all_results, self.report_time, extra_fields=('position_value',))
         else:
             self.exit_history = {}
             self.recent_exits = []
         
         self.group_by_zones()
-    
-    def load_exit_history(self):
-        exit_file = 'exit_history.json'
-        if os.path.exists(exit_file):
-            try:
-                with open(exit_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def save_exit_history(self):
-        try:
-            with open('exit_history.json', 'w') as f:
-                json.dump(self.exit_history, f, indent=2)
-        except:
-            pass
+        self._categorize()
     
     def get_ibd_ticker_display(self, r):
         """Format ticker with IBD star and link if applicable"""
@@ -70,81 +142,86 @@ class PortfolioReport:
         else:
             return r['ticker']
     
-    def update_exit_history(self):
-        now = datetime.now()
-        cutoff = now - timedelta(days=7)
-        
-        current_buys = set(r['ticker'] for r in self.all_results if r.get('psar_zone') in ['STRONG_BUY', 'BUY'])
-        current_others = {r['ticker']: r for r in self.all_results if r.get('psar_zone') not in ['STRONG_BUY', 'BUY']}
-        
-        previous_buys = set(self.exit_history.get('previous_buys', []))
-        
-        new_exits = []
-        for ticker in previous_buys:
-            if ticker in current_others and ticker not in current_buys:
-                result = current_others[ticker]
-                new_exits.append({
-                    'ticker': ticker,
-                    'exit_date': now.isoformat(),
-                    'exit_price': result['price'],
-                    'psar_zone': result.get('psar_zone', 'UNKNOWN'),
-                    'psar_momentum': result.get('psar_momentum', 5),
-                    'position_value': result.get('position_value', 0),
-                })
-        
-        exits_list = self.exit_history.get('exits', []) + new_exits
-        recent_exits = [e for e in exits_list if datetime.fromisoformat(e['exit_date']) >= cutoff]
+    def group_by_zones(self):
+        # Sort by momentum first, then position value - once for everything,
+        # then split into zones in a single pass (each zone keeps the order),
+        # totalling each zone's position value along the way
+        zones = {'STRONG_BUY': [], 'BUY': [], 'NEUTRAL': [], 'WEAK': [], 'SELL': []}
+        self.zone_values = dict.fromkeys(zones, 0)
+        for r in sorted(self.all_results, key=lambda x: (-x.get('psar_momentum', 0), -x['position_value'])):
+            zone = r.get('psar_zone')
+            zone_list = zones.get(zone)
+            if zone_list is not None:
+                zone_list.append(r)
+                self.zone_values[zone] += r['position_value']
         
-        self.exit_history = {'previous_buys': list(current_buys), 'exits': recent_exits, 'last_updated': now.isoformat()}
-        self.save_exit_history()
-        return sorted(recent_exits, key=lambda x: x['exit_date'], reverse=True)
+        self.strong_buys = zones['STRONG_BUY']
+        self.buys = zones['BUY']
+        self.neutrals = zones['NEUTRAL']
+        self.weak = zones['WEAK']
+        self.sells = zones['SELL']
     
-    def group_by_zones(self):
-        # Sort by momentum first, then position value
-        self.strong_buys = sorted([r for r in self.all_results if r.get('psar_zone') == 'STRONG_BUY'], 
-                                   key=lambda x: (-x.get('psar_momentum', 0), -x['position_value']))
-        self.buys = sorted([r for r in self.all_results if r.get('psar_zone') == 'BUY'], 
-                           key=lambda x: (-x.get('psar_momentum', 0), -x['position_value']))
-        self.neutrals = sorted([r for r in self.all_results if r.get('psar_zone') == 'NEUTRAL'], 
-                               key=lambda x: (-x.get('psar_momentum', 0), -x['position_value']))
-        self.weak = sorted([r for r in self.all_results if r.get('psar_zone') == 'WEAK'], 
-                           key=lambda x: (-x.get('psar_momentum', 0), -x['position_value']))
-        self.sells = sorted([r for r in self.all_results if r.get('psar_zone') == 'SELL'], 
-                            key=lambda x: (-x.get('psar_momentum', 0), -x['position_value']))
+    def _categorize(self):
+        """One pass over the results: render the per-row cells and collect the alert/section lists"""
+        self.improving = []
+        self.overbought = []
+        self.oversold = []
+        self.concentrated = []
+        self.concentrated_by_zone = {'STRONG_BUY': [], 'BUY': [], 'NEUTRAL': [], 'WEAK': [], 'SELL': []}
+        self.cc_candidates = []
+        
+        for r in self.all_results:
+            zone = r.get('psar_zone', 'UNKNOWN')
+            cc_zone = zone in ('NEUTRAL', 'WEAK', 'SELL')
+            if cc_zone and r.get('psar_momentum', 0) >= 6 and r.get('psar_distance', 0) < 0:
+                self.improving.append(r)
+            atr_status = r.get('atr_status')
+            if atr_status == 'OVERBOUGHT':
+                self.overbought.append(r)
+            elif atr_status == 'OVERSOLD' and zone in ('STRONG_BUY', 'BUY', 'NEUTRAL'):
+                self.oversold.append(r)
+            # Concentrated positions (and their covered calls) are mystocks only;
+            # friends get covered calls on any NEUTRAL/WEAK/SELL holding
+            if self.is_friends_mode:
+                if cc_zone:
+                    self.cc_candidates.append(r)
+            elif r.get('position_value', 0) >= 10000:
+                self.concentrated.append(r)
+                if zone in self.concentrated_by_zone:
+                    self.concentrated_by_zone[zone].append(r)
+                if cc_zone:
+                    self.cc_candidates.append(r)
+            
+            # A row can appear in several tables (concentrated, covered calls, all
+            # positions), so render its per-row cells once up front
+            r['_zone_color'] = self.get_zone_color(zone)
+            r['_zone_emoji'] = self.get_zone_emoji(zone)
+            r['_atr_html'] = self.get_atr_display(r)
+            r['_prsi_html'] = self.get_prsi_display(r)
+            r['_obv_html'] = self.get_obv_display(r.get('obv_status', 'NEUTRAL'))
+            r['_mom_html'] = self.get_momentum_display(r.get('psar_momentum', 5))
+            r['_ind_html'] = self.get_indicator_symbols(r)
+            r['_ticker_html'] = self.get_ibd_ticker_display(r)
+            r['_val_str'] = self.format_value(r['position_value'])
+            r['_price_str'] = f"${r['price']:.2f}"
     
     def get_zone_color(self, zone):
-        return {'STRONG_BUY': '#1e8449', 'BUY': '#27ae60', 'NEUTRAL': '#f39c12', 
-                'WEAK': '#e67e22', 'SELL': '#c0392b'}.get(zone, '#7f8c8d')
+        return zone_color(zone)
     
     def get_zone_emoji(self, zone):
-        return {'STRONG_BUY': '🟢🟢', 'BUY': '🟢', 'NEUTRAL': '🟡', 
-                'WEAK': '🟠', 'SELL': '🔴'}.get(zone, '⚪')
+        return zone_emoji(zone)
     
     def get_momentum_display(self, momentum):
-        if momentum >= 8:
-            return f"<span style='color:#1e8449; font-weight:bold;'>{momentum}</span>"
-        elif momentum >= 6:
-            return f"<span style='color:#27ae60;'>{momentum}</span>"
-        elif momentum >= 4:
-            return f"<span style='color:#f39c12;'>{momentum}</span>"
-        elif momentum >= 2:
-            return f"<span style='color:#e67e22;'>{momentum}</span>"
-        else:
-            return f"<span style='color:#c0392b;'>{momentum}</span>"
+        return momentum_display(momentum)
     
     def get_indicator_symbols(self, r):
         def sym(val):
-            return "<span style='color:#27ae60;'>✓</span>" if val else "<span style='color:#e74c3c;'>✗</span>"
+            return INDICATOR_YES if val else INDICATOR_NO
         return f"M{sym(r.get('has_macd'))} B{sym(r.get('has_bb'))} W{sym(r.get('has_willr'))} C{sym(r.get('has_coppock'))} U{sym(r.get('has_ultimate'))}"
     
     def get_obv_display(self, obv_status):
         """Get OBV status display"""
-        if obv_status == 'CONFIRM':
-            return "<span style='color:#27ae60;'>🟢</span>"
-        elif obv_status == 'DIVERGE':
-            return "<span style='color:#c0392b;'>🔴</span>"
-        else:
-            return "<span style='color:#f39c12;'>🟡</span>"
+        return OBV_DISPLAY.get(obv_status, OBV_NEUTRAL_DISPLAY)
     
     def format_value(self, value):
         if value >= 1000000:
@@ -156,6 +233,22 @@ class PortfolioReport:
         else:
             return ""
     
+    def _ticker(self, symbol):
+        """The report's yf.Ticker for a symbol, so its fetched data is reused"""
+        ticker_obj = self._tickers.get(symbol)
+        if ticker_obj is None:
+            import yfinance as yf  # Only option lookups need it - skipped on cache hits and -nocc
+            ticker_obj = self._tickers[symbol] = yf.Ticker(symbol)
+        return ticker_obj
+    
+    def get_covered_call_recommendations(self, candidates):
+        """get_covered_call_recommendation for each scan result, fetched concurrently, in order"""
+        if not candidates:
+            return []
+        with ThreadPoolExecutor(max_workers=min(OPTIONS_FETCH_WORKERS, len(candidates))) as executor:
+            return list(executor.map(lambda r: self.get_covered_call_recommendation(r['ticker'], r['price']),
+                                     candidates))
+    
     def get_covered_call_recommendation(self, ticker, current_price):
         """
         Get covered call recommendation.
@@ -163,37 +256,59 @@ class PortfolioReport:
         Whichever is FURTHER from current price.
         """
         try:
-            stock = yf.Ticker(ticker)
-            expirations = stock.options
+            # {'expirations': (...), expiration: calls DataFrame} - re-runs and
+            # tickers in both mystocks and friends skip the Yahoo round trips
+            if cache_load('no_options', ticker, NO_OPTIONS_CACHE_TTL):
+                return None
+            options = cache_load('options', ticker, OPTIONS_CACHE_TTL) or {}
+            expirations = options.get('expirations')
+            if expirations is None:
+                expirations = self._ticker(ticker).options
+                if not expirations:
+                    # No listed options - remembered for a day (fetch errors aren't)
+                    cache_store('no_options', ticker, True)
+                    return None
+                options['expirations'] = expirations
+                cache_store('options', ticker, options)
             if not expirations:
                 return None
             
+            # Days to each expiration, parsed once (fromisoformat is C, strptime isn't)
             today = datetime.now()
-            best_exp = None
-            for exp_str in expirations:
-                dte = (datetime.strptime(exp_str, '%Y-%m-%d') - today).days
+            exp_dtes = [(exp_str, (datetime.fromisoformat(exp_str) - today).days) for exp_str in expirations]
+            best_exp = best_dte = None
+            for exp_str, dte in exp_dtes:
                 if 21 <= dte <= 60:
-                    best_exp = exp_str
+                    best_exp, best_dte = exp_str, dte
                     break
             
             if not best_exp:
-                for exp_str in expirations:
-                    if (datetime.strptime(exp_str, '%Y-%m-%d') - today).days >= 14:
-                        best_exp = exp_str
+                for exp_str, dte in exp_dtes:
+                    if dte >= 14:
+                        best_exp, best_dte = exp_str, dte
                         break
             
             if not best_exp:
                 return None
             
-            calls = stock.option_chain(best_exp).calls
+            calls = options.get(best_exp)
+            if calls is None:
+                calls = options[best_exp] = self._ticker(ticker).option_chain(best_exp).calls
+                cache_store('options', ticker, options)
             if calls.empty:
                 return None
             
-            otm_calls = calls[calls['strike'] > current_price]
-            if otm_calls.empty:
+            # All the selection below is boolean masks over the raw columns, picking
+            # the first matching row - no intermediate DataFrames
+            strikes = calls['strike'].to_numpy(dtype=float)
+            bids = calls['bid'].to_numpy(dtype=float)
+            asks = calls['ask'].to_numpy(dtype=float)
+            
+            otm = strikes > current_price
+            if not otm.any():
                 return None
             
-            dte = (datetime.strptime(best_exp, '%Y-%m-%d') - today).days
+            dte = best_dte
             
             # Strategy: max(8% above price, delta 0.10 strike)
             # 8% above price
@@ -201,39 +316,30 @@ class PortfolioReport:
             
             # Delta 0.10 strike - typically ~15-20% OTM for 30-45 DTE
             # Look for call with delta closest to 0.10 if available
-            if 'delta' in otm_calls.columns:
-                delta_10_calls = otm_calls[otm_calls['delta'].between(0.08, 0.15)]
-                if not delta_10_calls.empty:
-                    delta_10_strike = delta_10_calls.iloc[0]['strike']
-                else:
-                    # Estimate: delta 0.10 is roughly 15-20% OTM
-                    delta_10_strike = current_price * 1.15
-            else:
-                # No delta available, estimate
-                delta_10_strike = current_price * 1.15
+            # Estimate otherwise: delta 0.10 is roughly 15-20% OTM
+            delta_10_strike = current_price * 1.15
+            if 'delta' in calls.columns:
+                deltas = calls['delta'].to_numpy(dtype=float)
+                delta_10 = np.flatnonzero(otm & (deltas >= 0.08) & (deltas <= 0.15))
+                if len(delta_10):
+                    delta_10_strike = strikes[delta_10[0]]
             
             # Use whichever is FURTHER from current price
             target_min_strike = max(min_strike_8pct, delta_10_strike)
             
             # Find calls at or above our target
-            target_calls = otm_calls[otm_calls['strike'] >= target_min_strike]
+            target = np.flatnonzero(otm & (strikes >= target_min_strike))
             
-            if not target_calls.empty:
+            if len(target):
                 # Get the first one at or above target with decent bid
-                target_calls_with_bid = target_calls[target_calls['bid'] > 0]
-                if not target_calls_with_bid.empty:
-                    best_call = target_calls_with_bid.iloc[0]
-                else:
-                    best_call = target_calls.iloc[0]
+                with_bid = target[bids[target] > 0]
+                best = with_bid[0] if len(with_bid) else target[0]
             else:
                 # Fallback to anything 5%+ OTM
-                fallback = otm_calls[otm_calls['strike'] >= current_price * 1.05]
-                if not fallback.empty:
-                    best_call = fallback.iloc[0]
-                else:
-                    best_call = otm_calls.iloc[0]
+                fallback = np.flatnonzero(otm & (strikes >= current_price * 1.05))
+                best = fallback[0] if len(fallback) else np.flatnonzero(otm)[0]
             
-            strike, bid, ask = best_call['strike'], best_call['bid'], best_call['ask']
+            strike, bid, ask = strikes[best], bids[best], asks[best]
             mid_price = (bid + ask) / 2 if bid > 0 else ask
             
             return {
@@ -245,69 +351,59 @@ class PortfolioReport:
         except:
             return None
     
+    def _start_sentiment_fetch(self):
+        """Submit the CBOE sentiment fetch (once) and return its future"""
+        if self._sentiment_future is None:
+            self._sentiment_future = _SENTIMENT_EXECUTOR.submit(_fetch_cboe_sentiment)
+        return self._sentiment_future
+    
     def build_email_body(self):
-        html = """
-        <html><head><style>
-            body { font-family: Arial, sans-serif; font-size: 12px; }
-            table { border-collapse: collapse; width: 100%; margin: 10px 0; }
-            th { padding: 8px; text-align: left; font-size: 11px; }
-            td { padding: 6px; border-bottom: 1px solid #ddd; font-size: 11px; }
-            tr:hover { background-color: #f5f5f5; }
-            .section-strongbuy { background-color: #1e8449; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
-            .section-buy { background-color: #27ae60; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
-            .section-neutral { background-color: #f39c12; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
-            .section-weak { background-color: #e67e22; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
-            .section-sell { background-color: #c0392b; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
-            .section-blue { background-color: #2980b9; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
-            .section-gray { background-color: #7f8c8d; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
-            .section-red { background-color: #c0392b; color: white; padding: 12px; margin: 20px 0 10px 0; font-size: 14px; font-weight: bold; }
-            .th-strongbuy { background-color: #1e8449; color: white; }
-            .th-buy { background-color: #27ae60; color: white; }
-            .th-neutral { background-color: #f39c12; color: white; }
-            .th-weak { background-color: #e67e22; color: white; }
-            .th-sell { background-color: #c0392b; color: white; }
-            .th-blue { background-color: #2980b9; color: white; }
-            .th-red { background-color: #c0392b; color: white; }
-            .th-gray { background-color: #7f8c8d; color: white; }
-            .alert-box { padding: 10px; margin: 10px 0; border-radius: 5px; }
-            .alert-green { background-color: #d4edda; border-left: 4px solid #27ae60; }
-            .alert-red { background-color: #f8d7da; border-left: 4px solid #c0392b; }
-            .summary-box { background-color: #ecf0f1; padding: 15px; margin: 15px 0; border-radius: 5px; }
-        </style></head><body>
-        """
+        sentiment_future = self._start_sentiment_fetch()
+        html = [HTML_HEAD]
         
-        html += f"<h2>📊 {self.report_title} Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}</h2>"
+        if self.include_covered_calls:
+            cc_candidates = self.cc_candidates[:20 if self.is_friends_mode else 15]
+        else:
+            cc_candidates = []
+        
+        # The option chains are another network wait independent of the sentiment
+        # fetch, so they run alongside it and are collected
+        # where the covered call sections are rendered
+        io_pool = ThreadPoolExecutor(max_workers=1)
+        cc_future = io_pool.submit(self.get_covered_call_recommendations, cc_candidates)
+        io_pool.shutdown(wait=False)
+        
+        html.append(f"<h2>📊 {self.report_title} Report - {self.report_time.strftime('%Y-%m-%d %H:%M')}</h2>")
         
         # MARKET SENTIMENT from CBOE (using Selenium)
         try:
-            from cboe import get_cboe_ratios_and_analyze
-            sentiment_text = get_cboe_ratios_and_analyze()
+            sentiment_text = sentiment_future.result()
             
             if sentiment_text:
                 if 'FAILED' not in sentiment_text:
-                    html += f"""
+                    html.append(f"""
                     <div style='background-color:#ecf0f1; border-left:4px solid #2c3e50; padding:10px; margin:10px 0;'>
                         <pre style='font-family: monospace; white-space: pre-wrap; margin: 0; font-size: 11px; color: #333;'>{sentiment_text}</pre>
                     </div>
-                    """
+                    """)
                 else:
                     # Show the error
-                    html += f"""
+                    html.append(f"""
                     <div style='background-color:#f8d7da; border-left:4px solid #dc3545; padding:10px; margin:10px 0;'>
                         <pre style='font-family: monospace; white-space: pre-wrap; margin: 0; font-size: 11px; color: #721c24;'>{sentiment_text}</pre>
                     </div>
-                    """
+                    """)
         except Exception as e:
-            html += f"""
+            html.append(f"""
             <div style='background-color:#f8d7da; border-left:4px solid #dc3545; padding:10px; margin:10px 0;'>
                 <strong>CBOE Sentiment Error:</strong> {type(e).__name__}: {str(e)}
             </div>
-            """
+            """)
         
         # SUMMARY - different format for friends vs mystocks
         if self.is_friends_mode:
             # Friends mode: just show counts, no dollar values
-            html += f"""
+            html.append(f"""
             <div class='summary-box'>
                 <h3 style='margin-top:0;'>Portfolio by PSAR Zone</h3>
                 <table style='width:auto;'>
@@ -319,19 +415,13 @@ class PortfolioReport:
                     <tr><td>🔴 <strong>SELL:</strong></td><td>{len(self.sells)}</td></tr>
                 </table>
             </div>
-            """
+            """)
         else:
             # Mystocks mode: show dollar values
             total_value = sum(r.get('position_value', 0) for r in self.all_results)
-            zone_values = {
-                'STRONG_BUY': sum(r['position_value'] for r in self.strong_buys),
-                'BUY': sum(r['position_value'] for r in self.buys),
-                'NEUTRAL': sum(r['position_value'] for r in self.neutrals),
-                'WEAK': sum(r['position_value'] for r in self.weak),
-                'SELL': sum(r['position_value'] for r in self.sells),
-            }
+            zone_values = self.zone_values
             
-            html += f"""
+            html.append(f"""
             <div class='summary-box'>
                 <h3 style='margin-top:0;'>Portfolio by PSAR Zone</h3>
                 <table style='width:auto;'>
@@ -343,103 +433,92 @@ class PortfolioReport:
                     <tr><td>🔴 <strong>SELL:</strong></td><td>{self.format_value(zone_values['SELL'])} ({len(self.sells)})</td></tr>
                 </table>
             </div>
-            """
+            """)
         
         # EXITS - only show for mystocks mode
         if not self.is_friends_mode and self.recent_exits:
-            html += "<div class='section-red'>🚨 RECENT ZONE EXITS (Last 7 Days)</div>"
-            html += "<table><tr><th class='th-red'>Ticker</th><th class='th-red'>Value</th><th class='th-red'>Date</th><th class='th-red'>Zone</th><th class='th-red'>Mom</th></tr>"
+            html.append("<div class='section-red'>🚨 RECENT ZONE EXITS (Last 7 Days)</div>")
+            html.append("<table><tr><th class='th-red'>Ticker</th><th class='th-red'>Value</th><th class='th-red'>Date</th><th class='th-red'>Zone</th><th class='th-red'>Mom</th></tr>")
             for e in self.recent_exits[:10]:
                 date_str = datetime.fromisoformat(e['exit_date']).strftime('%m/%d') if 'exit_date' in e else "?"
                 val_str = self.format_value(e.get('position_value', 0))
-                html += f"<tr><td><strong>{e['ticker']}</strong></td><td>{val_str}</td><td>{date_str}</td><td>{self.get_zone_emoji(e.get('psar_zone','?'))}</td><td>{self.get_momentum_display(e.get('psar_momentum', 5))}</td></tr>"
-            html += "</table>"
+                html.append(f"<tr><td><strong>{e['ticker']}</strong></td><td>{val_str}</td><td>{date_str}</td><td>{self.get_zone_emoji(e.get('psar_zone','?'))}</td><td>{self.get_momentum_display(e.get('psar_momentum', 5))}</td></tr>")
+            html.append("</table>")
         
         # IMPROVING STOCKS
-        improving = [r for r in self.all_results if r.get('psar_zone') in ['SELL', 'WEAK', 'NEUTRAL'] 
-                     and r.get('psar_momentum', 0) >= 6 and r.get('psar_distance', 0) < 0]
+        improving = self.improving
         if improving:
-            html += "<div class='alert-box alert-green'>"
-            html += f"<strong>⬆️ {len(improving)} positions improving (Momentum ≥6):</strong> "
-            html += ", ".join([f"<strong>{r['ticker']}</strong> (M:{r['psar_momentum']})" 
-                              for r in sorted(improving, key=lambda x: -x['psar_momentum'])[:8]])
-            html += "</div>"
+            html.append("<div class='alert-box alert-green'>")
+            html.append(f"<strong>⬆️ {len(improving)} positions improving (Momentum ≥6):</strong> ")
+            html.append(", ".join([f"<strong>{r['ticker']}</strong> (M:{r['psar_momentum']})" 
+                              for r in heapq.nsmallest(8, improving, key=lambda x: -x['psar_momentum'])]))
+            html.append("</div>")
         
         # 🔥 OVERBOUGHT ALERT - Stocks to sell or write covered calls on
-        overbought = [r for r in self.all_results if r.get('atr_status') == 'OVERBOUGHT']
+        overbought = self.overbought
         if overbought:
-            overbought.sort(key=lambda x: -x.get('position_value', 0))
-            html += "<div class='alert-box' style='background-color:#fff3cd; border-left:4px solid #ffc107;'>"
-            html += f"<strong>🔥 {len(overbought)} positions OVERBOUGHT (consider covered calls or trimming):</strong> "
-            html += ", ".join([f"<strong>{r['ticker']}</strong>" for r in overbought[:10]])
+            html.append("<div class='alert-box' style='background-color:#fff3cd; border-left:4px solid #ffc107;'>")
+            html.append(f"<strong>🔥 {len(overbought)} positions OVERBOUGHT (consider covered calls or trimming):</strong> ")
+            # Only the 10 largest are listed, so pick them rather than sorting the lot
+            html.append(", ".join([f"<strong>{r['ticker']}</strong>"
+                               for r in heapq.nsmallest(10, overbought, key=lambda x: -x.get('position_value', 0))]))
             if len(overbought) > 10:
-                html += f" +{len(overbought)-10} more"
-            html += "</div>"
+                html.append(f" +{len(overbought)-10} more")
+            html.append("</div>")
         
         # ❄️ OVERSOLD ALERT - Good positions to add to
-        oversold = [r for r in self.all_results if r.get('atr_status') == 'OVERSOLD' 
-                   and r.get('psar_zone') in ['STRONG_BUY', 'BUY', 'NEUTRAL']]
+        oversold = self.oversold
         if oversold:
-            oversold.sort(key=lambda x: -x.get('position_value', 0))
-            html += "<div class='alert-box' style='background-color:#d1ecf1; border-left:4px solid #17a2b8;'>"
-            html += f"<strong>❄️ {len(oversold)} positions OVERSOLD (good to add):</strong> "
-            html += ", ".join([f"<strong>{r['ticker']}</strong>" for r in oversold[:10]])
+            html.append("<div class='alert-box' style='background-color:#d1ecf1; border-left:4px solid #17a2b8;'>")
+            html.append(f"<strong>❄️ {len(oversold)} positions OVERSOLD (good to add):</strong> ")
+            html.append(", ".join([f"<strong>{r['ticker']}</strong>"
+                               for r in heapq.nsmallest(10, oversold, key=lambda x: -x.get('position_value', 0))]))
             if len(oversold) > 10:
-                html += f" +{len(oversold)-10} more"
-            html += "</div>"
+                html.append(f" +{len(oversold)-10} more")
+            html.append("</div>")
         
         # CONCENTRATED POSITIONS - only for mystocks mode with position values
         if not self.is_friends_mode:
-            concentrated = [r for r in self.all_results if r.get('position_value', 0) >= 10000]
+            concentrated = self.concentrated
             if concentrated:
-                html += f"<div class='section-gray'>💎 CONCENTRATED POSITIONS (>$10K) - {len(concentrated)} positions, {self.format_value(sum(r['position_value'] for r in concentrated))}</div>"
+                html.append(f"<div class='section-gray'>💎 CONCENTRATED POSITIONS (>$10K) - {len(concentrated)} positions, {self.format_value(sum(r['position_value'] for r in concentrated))}</div>")
                 
-                for zone_key, zone_class, zone_list in [
-                    ('STRONG_BUY', 'strongbuy', [r for r in concentrated if r.get('psar_zone') == 'STRONG_BUY']),
-                    ('BUY', 'buy', [r for r in concentrated if r.get('psar_zone') == 'BUY']),
-                    ('NEUTRAL', 'neutral', [r for r in concentrated if r.get('psar_zone') == 'NEUTRAL']),
-                    ('WEAK', 'weak', [r for r in concentrated if r.get('psar_zone') == 'WEAK']),
-                    ('SELL', 'sell', [r for r in concentrated if r.get('psar_zone') == 'SELL']),
-                ]:
+                for zone_key, zone_class in [('STRONG_BUY', 'strongbuy'), ('BUY', 'buy'), ('NEUTRAL', 'neutral'),
+                                             ('WEAK', 'weak'), ('SELL', 'sell')]:
+                    zone_list = self.concentrated_by_zone[zone_key]
                     if zone_list:
                         zone_val = sum(r['position_value'] for r in zone_list)
-                        html += f"<h4 style='color:{self.get_zone_color(zone_key)};'>{self.get_zone_emoji(zone_key)} {zone_key} ({len(zone_list)}, {self.format_value(zone_val)})</h4>"
-                        html += self._build_table_with_value(zone_list, zone_class)
+                        html.append(f"<h4 style='color:{self.get_zone_color(zone_key)};'>{self.get_zone_emoji(zone_key)} {zone_key} ({len(zone_list)}, {self.format_value(zone_val)})</h4>")
+                        self._build_table_with_value(html, zone_list, zone_class)
             
             # COVERED CALLS - only for mystocks mode
-            cc_candidates = [r for r in concentrated if r.get('psar_zone') in ['NEUTRAL', 'WEAK', 'SELL']] if concentrated else []
             if cc_candidates:
-                html += "<div class='section-blue'>📞 COVERED CALL OPPORTUNITIES</div>"
-                html += "<table><tr><th class='th-blue'>Ticker</th><th class='th-blue'>Value</th><th class='th-blue'>Zone</th><th class='th-blue'>Price</th><th class='th-blue'>Exp</th><th class='th-blue'>Strike</th><th class='th-blue'>Upside</th><th class='th-blue'>Ann.Yield</th></tr>"
+                html.append("<div class='section-blue'>📞 COVERED CALL OPPORTUNITIES</div>")
+                html.append("<table><tr><th class='th-blue'>Ticker</th><th class='th-blue'>Value</th><th class='th-blue'>Zone</th><th class='th-blue'>Price</th><th class='th-blue'>Exp</th><th class='th-blue'>Strike</th><th class='th-blue'>Upside</th><th class='th-blue'>Ann.Yield</th></tr>")
                 
-                for r in cc_candidates[:15]:
-                    cc = self.get_covered_call_recommendation(r['ticker'], r['price'])
-                    zone = r.get('psar_zone', 'UNKNOWN')
+                for r, cc in zip(cc_candidates, cc_future.result()):
                     if cc:
-                        html += f"<tr><td><strong>{r['ticker']}</strong></td><td>{self.format_value(r['position_value'])}</td><td style='color:{self.get_zone_color(zone)};'>{self.get_zone_emoji(zone)}</td><td>${r['price']:.2f}</td><td>{cc['expiration']} ({cc['dte']}d)</td><td>${cc['strike']:.2f}</td><td>+{cc['upside_to_strike']:.1f}%</td><td><strong>{cc['annualized_yield']:.0f}%</strong></td></tr>"
+                        html.append(f"<tr><td><strong>{r['ticker']}</strong></td><td>{r['_val_str']}</td><td style='color:{r['_zone_color']};'>{r['_zone_emoji']}</td><td>{r['_price_str']}</td><td>{cc['expiration']} ({cc['dte']}d)</td><td>${cc['strike']:.2f}</td><td>+{cc['upside_to_strike']:.1f}%</td><td><strong>{cc['annualized_yield']:.0f}%</strong></td></tr>")
                     else:
-                        html += f"<tr><td><strong>{r['ticker']}</strong></td><td>{self.format_value(r['position_value'])}</td><td style='color:{self.get_zone_color(zone)};'>{self.get_zone_emoji(zone)}</td><td>${r['price']:.2f}</td><td colspan='4' style='color:#999;'>No options</td></tr>"
-                html += "</table>"
+                        html.append(f"<tr><td><strong>{r['ticker']}</strong></td><td>{r['_val_str']}</td><td style='color:{r['_zone_color']};'>{r['_zone_emoji']}</td><td>{r['_price_str']}</td><td colspan='4' style='color:#999;'>No options</td></tr>")
+                html.append("</table>")
         
         # COVERED CALLS FOR FRIENDS MODE
         if self.is_friends_mode:
-            cc_candidates = [r for r in self.all_results if r.get('psar_zone') in ['NEUTRAL', 'WEAK', 'SELL']]
             if cc_candidates:
-                html += "<div class='section-blue'>📞 POTENTIAL COVERED CALL OPPORTUNITIES</div>"
-                html += "<p style='font-size:11px;color:#666;margin:5px 0;'>Stocks in NEUTRAL/WEAK/SELL zones - consider writing covered calls to generate income while waiting</p>"
-                html += "<table><tr><th class='th-blue'>Ticker</th><th class='th-blue'>Zone</th><th class='th-blue'>Price</th><th class='th-blue'>PSAR%</th><th class='th-blue'>Exp</th><th class='th-blue'>Strike</th><th class='th-blue'>Upside</th><th class='th-blue'>Ann.Yield</th></tr>"
+                html.append("<div class='section-blue'>📞 POTENTIAL COVERED CALL OPPORTUNITIES</div>")
+                html.append("<p style='font-size:11px;color:#666;margin:5px 0;'>Stocks in NEUTRAL/WEAK/SELL zones - consider writing covered calls to generate income while waiting</p>")
+                html.append("<table><tr><th class='th-blue'>Ticker</th><th class='th-blue'>Zone</th><th class='th-blue'>Price</th><th class='th-blue'>PSAR%</th><th class='th-blue'>Exp</th><th class='th-blue'>Strike</th><th class='th-blue'>Upside</th><th class='th-blue'>Ann.Yield</th></tr>")
                 
-                for r in cc_candidates[:20]:
-                    cc = self.get_covered_call_recommendation(r['ticker'], r['price'])
-                    zone = r.get('psar_zone', 'UNKNOWN')
+                for r, cc in zip(cc_candidates, cc_future.result()):
                     if cc:
-                        html += f"<tr><td><strong>{r['ticker']}</strong></td><td style='color:{self.get_zone_color(zone)};'>{self.get_zone_emoji(zone)}</td><td>${r['price']:.2f}</td><td>{r['psar_distance']:+.1f}%</td><td>{cc['expiration']} ({cc['dte']}d)</td><td>${cc['strike']:.2f}</td><td>+{cc['upside_to_strike']:.1f}%</td><td><strong>{cc['annualized_yield']:.0f}%</strong></td></tr>"
+                        html.append(f"<tr><td><strong>{r['ticker']}</strong></td><td style='color:{r['_zone_color']};'>{r['_zone_emoji']}</td><td>{r['_price_str']}</td><td>{r['psar_distance']:+.1f}%</td><td>{cc['expiration']} ({cc['dte']}d)</td><td>${cc['strike']:.2f}</td><td>+{cc['upside_to_strike']:.1f}%</td><td><strong>{cc['annualized_yield']:.0f}%</strong></td></tr>")
                     else:
-                        html += f"<tr><td><strong>{r['ticker']}</strong></td><td style='color:{self.get_zone_color(zone)};'>{self.get_zone_emoji(zone)}</td><td>${r['price']:.2f}</td><td>{r['psar_distance']:+.1f}%</td><td colspan='4' style='color:#999;'>No options available</td></tr>"
-                html += "</table>"
+                        html.append(f"<tr><td><strong>{r['ticker']}</strong></td><td style='color:{r['_zone_color']};'>{r['_zone_emoji']}</td><td>{r['_price_str']}</td><td>{r['psar_distance']:+.1f}%</td><td colspan='4' style='color:#999;'>No options available</td></tr>")
+                html.append("</table>")
         
         # ALL POSITIONS BY ZONE
-        html += "<div class='section-gray'>📋 ALL POSITIONS BY ZONE</div>"
+        html.append("<div class='section-gray'>📋 ALL POSITIONS BY ZONE</div>")
         
         for zone_key, zone_class, zone_list, zone_title in [
             ('STRONG_BUY', 'strongbuy', self.strong_buys, '🟢🟢 STRONG BUY'),
@@ -449,21 +528,21 @@ class PortfolioReport:
             ('SELL', 'sell', self.sells, '🔴 SELL'),
         ]:
             if zone_list:
-                html += f"<h4 style='color:{self.get_zone_color(zone_key)};'>{zone_title} ({len(zone_list)})</h4>"
+                html.append(f"<h4 style='color:{self.get_zone_color(zone_key)};'>{zone_title} ({len(zone_list)})</h4>")
                 if self.is_friends_mode:
-                    html += self._build_zone_table_no_value(zone_list, zone_class)
+                    self._build_zone_table_no_value(html, zone_list, zone_class)
                 else:
-                    html += self._build_zone_table(zone_list, zone_class)
+                    self._build_zone_table(html, zone_list, zone_class)
         
-        html += """<hr><p style='font-size:10px;color:#7f8c8d;'>
+        html.append("""<hr><p style='font-size:10px;color:#7f8c8d;'>
         <strong>⭐ = IBD Stock</strong> (click star for IBD chart &amp; buy points)<br>
         <strong>Momentum (1-10):</strong> Trajectory since signal start. 8-10=Strong, 4-7=Neutral, 1-3=Weak<br>
         <strong>ATR:</strong> 🔥=Overbought (price > EMA8+ATR, consider selling/covered calls) | ❄️=Oversold (good to buy) | —=Normal<br>
         <strong>PRSI:</strong> PSAR on RSI. ↗️=RSI trending up | ↘️=RSI trending down<br>
         <strong>IR:</strong> MACD(35)+Ultimate(15)+Williams(15)+Bollinger(15)+Coppock(20)=Max 100
-        </p></body></html>"""
+        </p></body></html>""")
         
-        return html
+        return "".join(html)
     
     def get_atr_display(self, result):
         """Get ATR status display with % from EMA8"""
@@ -481,42 +560,23 @@ class PortfolioReport:
         prsi_bullish = result.get('prsi_bullish', True)
         return '↗️' if prsi_bullish else '↘️'
     
-    def _build_table_with_value(self, stocks, zone_class):
-        """Full table with Value column and Indicators"""
-        html = f"<table><tr><th class='th-{zone_class}'>Ticker</th><th class='th-{zone_class}'>Value</th><th class='th-{zone_class}'>Price</th><th class='th-{zone_class}'>PSAR%</th><th class='th-{zone_class}'>Mom</th><th class='th-{zone_class}'>ATR</th><th class='th-{zone_class}'>PRSI</th><th class='th-{zone_class}'>OBV</th><th class='th-{zone_class}'>IR</th><th class='th-{zone_class}'>Indicators</th></tr>"
-        for r in stocks:
-            zone_color = self.get_zone_color(r.get('psar_zone', 'UNKNOWN'))
-            obv_html = self.get_obv_display(r.get('obv_status', 'NEUTRAL'))
-            atr_html = self.get_atr_display(r)
-            prsi_html = self.get_prsi_display(r)
-            ticker_display = self.get_ibd_ticker_display(r)
-            html += f"<tr><td><strong>{ticker_display}</strong></td><td><strong>{self.format_value(r['position_value'])}</strong></td><td>${r['price']:.2f}</td><td style='color:{zone_color};font-weight:bold;'>{r['psar_distance']:+.1f}%</td><td>{self.get_momentum_display(r.get('psar_momentum', 5))}</td><td>{atr_html}</td><td>{prsi_html}</td><td>{obv_html}</td><td>{r['signal_weight']}</td><td style='font-size:10px;'>{self.get_indicator_symbols(r)}</td></tr>"
-        return html + "</table>"
+    def _build_table_with_value(self, html, stocks, zone_class):
+        """Full table with Value column and Indicators, appended to html"""
+        html.append(ZONE_TABLE_HEADERS['with_indicators'].format(zone_class=zone_class))
+        html.extend(map(ZONE_TABLE_ROWS['with_indicators'].format_map, stocks))
+        html.append("</table>")
     
-    def _build_zone_table(self, stocks, zone_class):
-        """Table with Value column for mystocks mode"""
-        html = f"<table><tr><th class='th-{zone_class}'>Ticker</th><th class='th-{zone_class}'>Value</th><th class='th-{zone_class}'>Price</th><th class='th-{zone_class}'>PSAR%</th><th class='th-{zone_class}'>Mom</th><th class='th-{zone_class}'>ATR</th><th class='th-{zone_class}'>PRSI</th><th class='th-{zone_class}'>OBV</th><th class='th-{zone_class}'>IR</th></tr>"
-        for r in stocks:
-            zone_color = self.get_zone_color(r.get('psar_zone', 'UNKNOWN'))
-            val_str = self.format_value(r.get('position_value', 0))
-            obv_html = self.get_obv_display(r.get('obv_status', 'NEUTRAL'))
-            atr_html = self.get_atr_display(r)
-            prsi_html = self.get_prsi_display(r)
-            ticker_display = self.get_ibd_ticker_display(r)
-            html += f"<tr><td><strong>{ticker_display}</strong></td><td>{val_str}</td><td>${r['price']:.2f}</td><td style='color:{zone_color};'>{r['psar_distance']:+.1f}%</td><td>{self.get_momentum_display(r.get('psar_momentum', 5))}</td><td>{atr_html}</td><td>{prsi_html}</td><td>{obv_html}</td><td>{r['signal_weight']}</td></tr>"
-        return html + "</table>"
+    def _build_zone_table(self, html, stocks, zone_class):
+        """Table with Value column for mystocks mode, appended to html"""
+        html.append(ZONE_TABLE_HEADERS['with_value'].format(zone_class=zone_class))
+        html.extend(map(ZONE_TABLE_ROWS['with_value'].format_map, stocks))
+        html.append("</table>")
     
-    def _build_zone_table_no_value(self, stocks, zone_class):
-        """Table without Value column for friends mode"""
-        html = f"<table><tr><th class='th-{zone_class}'>Ticker</th><th class='th-{zone_class}'>Price</th><th class='th-{zone_class}'>PSAR%</th><th class='th-{zone_class}'>Mom</th><th class='th-{zone_class}'>ATR</th><th class='th-{zone_class}'>PRSI</th><th class='th-{zone_class}'>OBV</th><th class='th-{zone_class}'>IR</th></tr>"
-        for r in stocks:
-            zone_color = self.get_zone_color(r.get('psar_zone', 'UNKNOWN'))
-            obv_html = self.get_obv_display(r.get('obv_status', 'NEUTRAL'))
-            atr_html = self.get_atr_display(r)
-            prsi_html = self.get_prsi_display(r)
-            ticker_display = self.get_ibd_ticker_display(r)
-            html += f"<tr><td><strong>{ticker_display}</strong></td><td>${r['price']:.2f}</td><td style='color:{zone_color};'>{r['psar_distance']:+.1f}%</td><td>{self.get_momentum_display(r.get('psar_momentum', 5))}</td><td>{atr_html}</td><td>{prsi_html}</td><td>{obv_html}</td><td>{r['signal_weight']}</td></tr>"
-        return html + "</table>"
+    def _build_zone_table_no_value(self, html, stocks, zone_class):
+        """Table without Value column for friends mode, appended to html"""
+        html.append(ZONE_TABLE_HEADERS['no_value'].format(zone_class=zone_class))
+        html.extend(map(ZONE_TABLE_ROWS['no_value'].format_map, stocks))
+        html.append("</table>")
     
     def send_email(self, additional_email=None, custom_title=None):
         sender_email = os.getenv("GMAIL_EMAIL")
@@ -527,33 +587,30 @@ class PortfolioReport:
             print("✗ Missing email credentials")
             return
         
+        # Credentials are there, so a body will be built - get the browser fetch going
+        # while the subject is put together
+        self._start_sentiment_fetch()
+        
         # Use custom title if provided
         self.report_title = custom_title if custom_title else "Portfolio"
         
         # Build subject line - different for friends vs mystocks
+        timestamp = self.report_time.strftime('%m/%d %H:%M')
         if self.is_friends_mode:
-            msg_subject = f"📊 {self.report_title}: {len(self.strong_buys)} Strong Buy, {len(self.buys)} Buy - {datetime.now().strftime('%m/%d %H:%M')}"
+            msg_subject = f"📊 {self.report_title}: {len(self.strong_buys)} Strong Buy, {len(self.buys)} Buy - {timestamp}"
         else:
-            strong_buy_val = self.format_value(sum(r['position_value'] for r in self.strong_buys))
-            buy_val = self.format_value(sum(r['position_value'] for r in self.buys))
-            msg_subject = f"📊 {self.report_title}: {strong_buy_val} Strong Buy, {buy_val} Buy - {datetime.now().strftime('%m/%d %H:%M')}"
+            strong_buy_val = self.format_value(self.zone_values['STRONG_BUY'])
+            buy_val = self.format_value(self.zone_values['BUY'])
+            msg_subject = f"📊 {self.report_title}: {strong_buy_val} Strong Buy, {buy_val} Buy - {timestamp}"
         
         msg = MIMEMultipart('alternative')
         msg['Subject'] = msg_subject
         msg['From'] = sender_email
         
-        # Build recipient list
-        recipients = [recipient_email]
-        if additional_email:
-            recipients.append(additional_email)
-        msg['To'] = ", ".join(recipients)
-        
         msg.attach(MIMEText(self.build_email_body(), 'html'))
         
         try:
-            with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-                server.login(sender_email, sender_password)
-                server.send_message(msg)
+            recipients = send_message(msg, sender_email, sender_password, recipient_email, additional_email)
             print(f"\n✓ {self.report_title} report sent to: {', '.join(recipients)}")
             print(f"  SB:{len(self.strong_buys)}, B:{len(self.buys)}, N:{len(self.neutrals)}, W:{len(self.weak)}, S:{len(self.sells)}")
         except Exception as e:
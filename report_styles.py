@@ -0,0 +1,35 @@
+"""
+Zone and momentum display lookups shared by the market and portfolio reports.
+
+Both emails color and label PSAR zones and momentum scores the same way, so
+the tables live here once and each report imports them.
+"""
+
+ZONE_COLORS = {'STRONG_BUY': '#1e8449', 'BUY': '#27ae60', 'NEUTRAL': '#f39c12',
+               'WEAK': '#e67e22', 'SELL': '#c0392b'}
+ZONE_EMOJIS = {'STRONG_BUY': '🟢🟢', 'BUY': '🟢', 'NEUTRAL': '🟡',
+               'WEAK': '🟠', 'SELL': '🔴'}
+# Momentum span templates for 0-1, 2-3, 4-5, 6-7 and 8+
+MOMENTUM_SPANS = (
+    "<span style='color:#c0392b;'>{}</span>",
+    "<span style='color:#e67e22;'>{}</span>",
+    "<span style='color:#f39c12;'>{}</span>",
+    "<span style='color:#27ae60;'>{}</span>",
+    "<span style='color:#1e8449; font-weight:bold;'>{}</span>",
+)
+
+
+def zone_color(zone):
+    """Hex color for a PSAR zone (gray for unknown zones)"""
+    return ZONE_COLORS.get(zone, '#7f8c8d')
+
+
+def zone_emoji(zone):
+    """Emoji marker for a PSAR zone (white circle for unknown zones)"""
+    return ZONE_EMOJIS.get(zone, '⚪')
+
+
+def momentum_display(momentum):
+    """Momentum score wrapped in its color band span"""
+    # Two momentum points per band, capped at the 8+ band
+    return MOMENTUM_SPANS[max(0, min(int(momentum // 2), 4))].format(momentum)
@@ -4,12 +4,35 @@ Analyzes potential short candidates with squeeze risk warnings
 Includes deep ITM put recommendations for bearish positions
 """
 
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 import os
 import yfinance as yf
+from smtp_utils import send_message
+
+# Shorts report <head>: red header bar, section panels and score colors
+HTML_HEAD = """
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 20px; }
+                table { border-collapse: collapse; width: 100%; margin: 15px 0; }
+                th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+                th { background-color: #4a4a4a; color: white; }
+                tr:nth-child(even) { background-color: #f9f9f9; }
+                .header { background-color: #d32f2f; color: white; padding: 15px; margin-bottom: 20px; }
+                .section { margin: 20px 0; padding: 10px; background-color: #f5f5f5; border-radius: 5px; }
+                .warning { background-color: #fff3cd; border: 1px solid #ffc107; padding: 10px; margin: 10px 0; }
+                .good { background-color: #d4edda; }
+                .bad { background-color: #f8d7da; }
+                .score-high { color: #28a745; font-weight: bold; }
+                .score-low { color: #dc3545; }
+            </style>
+        </head>
+        <body>
+        """
+
 
 class ShortsReport:
     def __init__(self, scan_results, mc_filter=None, include_adr=False):
@@ -253,12 +276,12 @@ class ShortsReport:
                 warnings.append("OBV diverging")
         
         # EPS growth (negative = fundamental weakness = good for shorts)
-        eps = result.get('eps_growth')
+        eps = result.get('eps_growth')  # Decimal, e.g. 0.20 = 20%
         if eps is not None and eps < 0:
             score += 15
-        elif eps is not None and eps > 20:
+        elif eps is not None and eps > 0.20:
             score -= 10  # Strong growth - bad short
-            warnings.append(f"EPS growth {eps:.0f}%")
+            warnings.append(f"EPS growth {eps * 100:.0f}%")
         
         # Short interest analysis
         si = result.get('short_percent')
@@ -340,26 +363,7 @@ class ShortsReport:
         in_sell_zone = [r for r in scored_results if not r.get('psar_bullish', True)]
         in_buy_zone = [r for r in scored_results if r.get('psar_bullish', True)]
         
-        html = """
-        <html>
-        <head>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 20px; }
-                table { border-collapse: collapse; width: 100%; margin: 15px 0; }
-                th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-                th { background-color: #4a4a4a; color: white; }
-                tr:nth-child(even) { background-color: #f9f9f9; }
-                .header { background-color: #d32f2f; color: white; padding: 15px; margin-bottom: 20px; }
-                .section { margin: 20px 0; padding: 10px; background-color: #f5f5f5; border-radius: 5px; }
-                .warning { background-color: #fff3cd; border: 1px solid #ffc107; padding: 10px; margin: 10px 0; }
-                .good { background-color: #d4edda; }
-                .bad { background-color: #f8d7da; }
-                .score-high { color: #28a745; font-weight: bold; }
-                .score-low { color: #dc3545; }
-            </style>
-        </head>
-        <body>
-        """
+        html = [HTML_HEAD]
         
         # Header
         if self.is_market_scan:
@@ -372,16 +376,16 @@ class ShortsReport:
             scan_type = "Short Watchlist Scan"
             filter_desc = "shorts.txt"
         
-        html += f"""
+        html.append(f"""
         <div class="header">
             <h1>🐻 {scan_type}</h1>
             <p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
             <p>Filters: {filter_desc} | {len(scored_results)} stocks analyzed</p>
         </div>
-        """
+        """)
         
         # Guide
-        html += """
+        html.append("""
         <div class="section">
             <h3>📊 Short Score Guide</h3>
             <p><b>Score Components (max 100):</b></p>
@@ -401,10 +405,10 @@ class ShortsReport:
             </ul>
             <p><b>Squeeze Risk:</b> 🟢 Low (<15%) | 🟡 Moderate (15-25%) | 🔴 High (>25%)</p>
         </div>
-        """
+        """)
         
         # Summary
-        html += f"""
+        html.append(f"""
         <div class="section">
             <h3>📈 Summary</h3>
             <p>Total stocks scanned: <b>{len(scored_results)}</b></p>
@@ -413,74 +417,74 @@ class ShortsReport:
             <p>✅ Good short candidates (score ≥50): <b>{len(good_shorts)}</b></p>
             <p>⚠️ High squeeze risk (SI >20%): <b>{len(risky_shorts)}</b></p>
         </div>
-        """
+        """)
         
         # Squeeze risk warning
         if risky_shorts:
-            html += """
+            html.append("""
             <div class="warning">
                 <h3>⚠️ SQUEEZE RISK WARNING</h3>
                 <p>The following stocks have HIGH short interest (>20%). Shorting these carries significant squeeze risk:</p>
                 <ul>
-            """
+            """)
             for r in risky_shorts:
                 si = r.get('short_percent', 0)
-                html += f"<li><b>{r['ticker']}</b>: {si:.1f}% short interest</li>"
-            html += """
+                html.append(f"<li><b>{r['ticker']}</b>: {si:.1f}% short interest</li>")
+            html.append("""
                 </ul>
             </div>
-            """
+            """)
         
         # Good Short Candidates
         if good_shorts:
-            html += """
+            html.append("""
             <div class="section good">
                 <h3>✅ Best Short Candidates (Score ≥50, In SELL Zone)</h3>
-            """
-            html += self._build_shorts_table(good_shorts)
-            html += "</div>"
+            """)
+            self._build_shorts_table(html, good_shorts)
+            html.append("</div>")
         
         # PUT OPTIONS SECTION - for stocks in SELL zone
         put_candidates = [r for r in scored_results if not r.get('psar_bullish', True) and r.get('short_score', 0) >= 40]
         if put_candidates:
-            html += """
+            html.append("""
             <div class="section" style="background-color: #e8f4fd;">
                 <h3>🎯 PUT OPTIONS STRATEGY</h3>
                 <p style="font-size:11px;"><b>Strategy:</b> Buy deep ITM put (delta ~0.97+) for minimal time premium. 
                 Optionally sell OTM put to create a debit spread and reduce cost.</p>
                 <p style="font-size:11px;"><b>Expiration:</b> 30-45 days optimal for SELL signal duration</p>
-            """
-            html += self._build_puts_table(put_candidates[:15])
-            html += "</div>"
+            """)
+            self._build_puts_table(html, put_candidates[:15])
+            html.append("</div>")
         
         # All Results
-        html += """
+        html.append("""
         <div class="section">
             <h3>📋 All Scanned Stocks</h3>
-        """
-        html += self._build_shorts_table(scored_results)
-        html += "</div>"
+        """)
+        self._build_shorts_table(html, scored_results)
+        html.append("</div>")
         
         # Stocks to Avoid Shorting (in BUY zone)
         if in_buy_zone:
-            html += """
+            html.append("""
             <div class="section bad">
                 <h3>🚫 Avoid Shorting (In BUY Zone)</h3>
                 <p>These stocks are in uptrends - shorting them is risky:</p>
-            """
-            html += self._build_shorts_table(in_buy_zone)
-            html += "</div>"
+            """)
+            self._build_shorts_table(html, in_buy_zone)
+            html.append("</div>")
         
-        html += """
+        html.append("""
         </body>
         </html>
-        """
+        """)
         
-        return html
+        return "".join(html)
     
-    def _build_shorts_table(self, results):
-        """Build HTML table for short candidates"""
-        html = """
+    def _build_shorts_table(self, html, results):
+        """Append the HTML table for short candidates to html"""
+        html.append("""
         <table>
             <tr>
                 <th>Ticker</th>
@@ -498,7 +502,7 @@ class ShortsReport:
                 <th>RSI</th>
                 <th>Warnings</th>
             </tr>
-        """
+        """)
         
         for r in results:
             zone = r.get('psar_zone', 'UNKNOWN')
@@ -534,7 +538,7 @@ class ShortsReport:
             else:
                 prsi_display = '↘️'  # RSI trending down - good for shorts
             
-            html += f"""
+            html.append(f"""
             <tr>
                 <td><b>{r['ticker']}</b></td>
                 <td>{r.get('company', '')[:20]}</td>
@@ -551,14 +555,13 @@ class ShortsReport:
                 <td>{r.get('rsi', 50):.0f}</td>
                 <td style="font-size: 11px;">{', '.join(warnings) if warnings else '✓'}</td>
             </tr>
-            """
+            """)
         
-        html += "</table>"
-        return html
+        html.append("</table>")
     
-    def _build_puts_table(self, results):
-        """Build HTML table for put option recommendations"""
-        html = """
+    def _build_puts_table(self, html, results):
+        """Append the HTML table for put option recommendations to html"""
+        html.append("""
         <table>
             <tr>
                 <th>Ticker</th>
@@ -574,7 +577,7 @@ class ShortsReport:
                 <th>Net Cost</th>
                 <th>Max Profit</th>
             </tr>
-        """
+        """)
         
         for r in results:
             put = self.get_put_recommendation(r['ticker'], r['price'], r.get('psar_distance', 0))
@@ -618,7 +621,7 @@ class ShortsReport:
                     net_cost = cost
                     max_profit = "unlimited"
                 
-                html += f"""
+                html.append(f"""
                 <tr>
                     <td><b>{r['ticker']}</b></td>
                     <td>${r['price']:.2f}</td>
@@ -633,29 +636,27 @@ class ShortsReport:
                     <td><b>{net_cost}</b></td>
                     <td>{max_profit}</td>
                 </tr>
-                """
+                """)
             else:
-                html += f"""
+                html.append(f"""
                 <tr>
                     <td><b>{r['ticker']}</b></td>
                     <td>${r['price']:.2f}</td>
                     <td>{score}</td>
                     <td colspan="9" style="color:#999;">No options available</td>
                 </tr>
-                """
+                """)
         
-        html += "</table>"
+        html.append("</table>")
         
         # Add legend
-        html += """
+        html.append("""
         <p style="font-size:10px;color:#666;margin-top:10px;">
         <b>Legend:</b> ITM% 🟢 30%+ (delta ~0.97) | 🟡 20-30% | 🔴 <20% (low delta) | 
         Extr% 🟢 <5% ideal | 🟡 5-10% | 🔴 >10% (too much premium) |
         Sell Put = ~25% below price for cushion
         </p>
-        """
-        
-        return html
+        """)
     
     def generate_tracking_sheet(self, output_dir=None):
         """Generate Google Sheets CSV for tracking shorts"""
@@ -702,8 +703,13 @@ class ShortsReport:
             return False
         
         # Build subject
-        good_shorts = len([r for r in self.all_results if r.get('short_score', 0) >= 50 and not r.get('psar_bullish', True)])
-        high_risk = len([r for r in self.all_results if r.get('short_percent') and r.get('short_percent') > 20])
+        good_shorts = 0
+        high_risk = 0
+        for r in self.all_results:
+            if r.get('short_score', 0) >= 50 and not r.get('psar_bullish', True):
+                good_shorts += 1
+            if r.get('short_percent') and r.get('short_percent') > 20:
+                high_risk += 1
         
         if self.is_market_scan:
             subject = f"🐻 Market Short Scan: {good_shorts} Candidates, {high_risk} Squeeze Risk"
@@ -715,20 +721,13 @@ class ShortsReport:
         msg['Subject'] = subject
         msg['From'] = gmail_email
         
-        recipients = [recipient]
-        if additional_email:
-            recipients.append(additional_email)
-        msg['To'] = ', '.join(recipients)
-        
         # Attach HTML
         html_body = self.build_email_body()
         msg.attach(MIMEText(html_body, 'html'))
         
         # Send
         try:
-            with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-                server.login(gmail_email, gmail_password)
-                server.sendmail(gmail_email, recipients, msg.as_string())
+            recipients = send_message(msg, gmail_email, gmail_password, recipient, additional_email)
             
             print(f"\n✓ Email sent to: {', '.join(recipients)}")
             print(f"  Good shorts: {good_shorts}, Squeeze risk: {high_risk}")
@@ -0,0 +1,87 @@
+"""
+Shared Gmail SMTP session for the report emails.
+
+The first send opens an SMTP_SSL connection and logs in; later sends in the
+same run reuse it (after a NOOP check, reconnecting if the socket went stale)
+instead of paying for a fresh TLS handshake and AUTH each time. The session is
+closed at interpreter exit.
+"""
+
+import atexit
+import smtplib
+import threading
+
+SMTP_HOST = 'smtp.gmail.com'
+SMTP_PORT = 465
+
+_server = None
+_credentials = None
+_lock = threading.Lock()
+
+
+def _close():
+    """Quit the shared session if one is open"""
+    global _server, _credentials
+    if _server is not None:
+        try:
+            _server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+    _server = _credentials = None
+
+
+def _is_alive(server):
+    try:
+        return server.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _recipient_list(recipient_email, additional_email=None):
+    """Primary recipient plus any extras (one address or a list of them)"""
+    if not additional_email:
+        return [recipient_email]
+    if isinstance(additional_email, str):
+        return [recipient_email, additional_email]
+    return [recipient_email, *additional_email]
+
+
+def _connect(sender_email, sender_password):
+    """Open and log in the shared session"""
+    global _server, _credentials
+    server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT)
+    try:
+        server.login(sender_email, sender_password)
+    except Exception:
+        server.close()
+        raise
+    _server, _credentials = server, (sender_email, sender_password)
+
+
+def send_message(msg, sender_email, sender_password, recipient, additional_email=None):
+    """Send msg to recipient, with additional_email (one address or a list) as blind copies.
+    
+    Only recipient goes in the To header. The extra addresses get their own
+    RCPT TO on the same upload, so they can't see each other. The message goes
+    through the shared session, which connects/logs in only when needed.
+    Returns the full recipient list.
+    """
+    to_addrs = _recipient_list(recipient, additional_email)
+    del msg['To']
+    msg['To'] = recipient
+    with _lock:
+        if _server is not None and (_credentials != (sender_email, sender_password) or not _is_alive(_server)):
+            _close()
+        if _server is None:
+            _connect(sender_email, sender_password)
+        try:
+            _server.send_message(msg, to_addrs=to_addrs)
+        except smtplib.SMTPServerDisconnected:
+            # Dropped between the NOOP and the send - reconnect once and retry
+            _close()
+            _connect(sender_email, sender_password)
+            _server.send_message(msg, to_addrs=to_addrs)
+    return to_addrs
+
+
+atexit.register(_close)